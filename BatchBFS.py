@@ -0,0 +1,137 @@
+from array import array
+from typing import List, NamedTuple, Sequence
+import re
+
+from Maze import BLOCKED, Maze
+
+# translation table from contents codes to the character "1" for open cells
+#   and "0" for blocked ones
+OPEN_CHARS = bytes(ord("0") if code == BLOCKED else ord("1") for code in range(256))
+
+
+class BatchResult(NamedTuple):
+    ''' the outcome of one breadth first search for every maze in a batch
+            lengths:   number of cells on a shortest path, as len(path) of
+                       Maze.bfs, or 0 if the goal cannot be reached
+            counts:    number of cells reached from the start, up to the end
+                       of the level that holds the goal; Maze.bfs stops
+                       partway through that level, so its count can be
+                       lower; all the cells reached, as for Maze.bfs, if the
+                       goal cannot be reached
+            solvable:  whether the goal can be reached '''
+    lengths: array
+    counts: array
+    solvable: List[bool]
+
+
+class BatchBFS:
+    ''' breadth first search over many mazes of the same shape at once, for
+        experiment sweeps over thousands of small mazes
+
+        The mazes are stacked into one Python int used as a bitboard: each
+        maze is a block of rows of cols + 1 bits, followed by a guard row, so
+        the last bit of each row and the whole guard row are always blocked.
+        A frontier then moves one step in all four directions, in every maze
+        together, with four shifts, and the guards stop it from wrapping to
+        the next row or spilling into the next maze. Each level of the
+        search is a handful of big int operations that run in C over the
+        whole batch, rather than a Python loop per cell. '''
+
+    def __init__(self, mazes: Sequence[Maze]):
+        '''
+        Args:
+            mazes: 4-connected mazes that all have the same number of rows and
+                   cols; their starts and goals may differ
+        Raises:
+            ValueError if mazes is empty, or holds an 8-connected maze or
+            mazes of different shapes
+        '''
+        if not mazes:
+            raise ValueError("BatchBFS needs at least one maze")
+        rows, cols = mazes[0]._num_rows, mazes[0]._num_cols
+        for maze in mazes:
+            if maze._connectivity != 4:
+                raise ValueError("BatchBFS searches 4-connected mazes only")
+            if (maze._num_rows, maze._num_cols) != (rows, cols):
+                raise ValueError(f"every maze must be {rows}x{cols}, got {maze._num_rows}x{maze._num_cols}")
+
+        self._num_mazes = len(mazes)
+        self._width = width = cols + 1
+        # each block is padded to whole bytes, so that a block can be cut out
+        #   of the bitboard's bytes and a byte never holds bits of two mazes
+        self._block_bytes = -(-(rows + 1) * width // 8)
+        self._block_bits = block_bits = self._block_bytes * 8
+
+        # bit strings are built lowest bit first, one block per maze, and
+        #   reversed to parse them as a binary number
+        blocks = []
+        start = goal = 0
+        for number, maze in enumerate(mazes):
+            cells = maze._contents.translate(OPEN_CHARS)
+            block = b"".join(cells[row * cols:(row + 1) * cols] + b"0" for row in range(rows))
+            blocks.append(block.ljust(block_bits, b"0"))
+            offset = number * block_bits
+            start |= 1 << offset + self._bit(maze._start_index, cols)
+            goal |= 1 << offset + self._bit(maze._goal_index, cols)
+        self._open = int(b"".join(blocks)[::-1], 2)
+        self._start = start
+        self._goal = goal
+
+    def _bit(self, index: int, cols: int) -> int:
+        ''' returns the bit within a block of the cell at a buffer index '''
+        row, col = divmod(index, cols)
+        return row * self._width + col
+
+    def _counts(self, visited: int, numbers: Sequence[int]) -> List[int]:
+        ''' returns the number of cells visited in each of the numbered mazes,
+            not counting the start '''
+        size = self._block_bytes
+        data = visited.to_bytes(self._num_mazes * size, "little")
+        return [int.from_bytes(data[number * size:(number + 1) * size], "little").bit_count() - 1
+                for number in numbers]
+
+    def solve(self) -> BatchResult:
+        ''' runs breadth first search from the start to the goal of every
+            maze, one level at a time in all of them together; a maze drops
+            out of the batch once its goal is reached
+        Returns:
+            a BatchResult, with the mazes in the order they were given
+        '''
+        num_mazes, width = self._num_mazes, self._width
+        size = self._block_bytes
+        lengths = array('i', [0]) * num_mazes
+        counts = array('i', [0]) * num_mazes
+        solvable = [False] * num_mazes
+
+        open_, goal = self._open, self._goal
+        frontier = visited = self._start
+        level = 1
+        while frontier:
+            reached = frontier & goal
+            if reached:
+                # the goal bit is the only bit of a maze in its byte that can
+                #   be in goal, so each nonzero byte is one maze that finished
+                data = reached.to_bytes(num_mazes * size, "little")
+                finished = [match.start() // size for match in re.finditer(b"[^\x00]", data)]
+                for number, count in zip(finished, self._counts(visited, finished)):
+                    lengths[number] = level
+                    counts[number] = count
+                    solvable[number] = True
+
+                done = bytearray(num_mazes * size)
+                for number in finished:
+                    done[number * size:(number + 1) * size] = b"\xff" * size
+                keep = ~int.from_bytes(done, "little")
+                open_ &= keep
+                frontier &= keep
+                goal &= keep
+
+            frontier = (frontier << 1 | frontier >> 1 | frontier << width | frontier >> width) & open_ & ~visited
+            visited |= frontier
+            level += 1
+
+        # every maze still in the batch has searched all it can reach
+        unsolved = [number for number in range(num_mazes) if not solvable[number]]
+        for number, count in zip(unsolved, self._counts(visited, unsolved)):
+            counts[number] = count
+        return BatchResult(lengths, counts, solvable)
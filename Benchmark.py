@@ -0,0 +1,208 @@
+''' benchmark harness for the Maze searches: solves seeded random mazes over
+    a sweep of sizes and densities with every solver, records time, memory,
+    cells generated and frontier peak, writes the results as JSON, and can
+    flag regressions against a saved baseline; run "python Benchmark.py -h" '''
+
+from typing import Dict, Iterator, List, Optional, Tuple
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from Maze import SEARCHES, Maze, Position
+
+SIZES = [10, 100, 500, 1000, 2000, 4000]
+DENSITIES = [0.0, 0.1, 0.2, 0.3, 0.4]
+
+# seconds a fresh interpreter may spend importing Maze (with its bytecode
+#   cached), not counting interpreter startup; import_time measured 8 to 11 ms
+#   over ten runs on the development machine (python 3.11), so this leaves
+#   about 3x headroom for slower or busier CI machines
+IMPORT_BUDGET = 0.030
+
+
+def positive_int(text: str) -> int:
+    ''' argparse type for a count that must be at least 1 '''
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
+def measure(maze: Maze, solver: str, repeat: int, memory: bool) -> Dict:
+    ''' runs one solver on one maze
+    Args:
+        repeat:  number of timed runs, at least 1; the fastest one is kept
+        memory:  also run once under tracemalloc to find the peak allocation,
+                 which is kept out of the timed runs as it slows them down
+    Returns:
+        a dict of the measurements
+    Raises:
+        ValueError if repeat is less than 1
+    '''
+    if repeat < 1:
+        raise ValueError(f"repeat must be at least 1, got {repeat}")
+    seconds = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = maze.search(solver)
+        seconds = min(seconds, time.perf_counter() - start)
+
+    peak_bytes = None
+    if memory:
+        tracemalloc.start()
+        maze.search(solver)
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {"seconds": seconds, "peak_bytes": peak_bytes, "count": result.count,
+            "path_length": len(result.path), "frontier_peak": result.frontier_peak}
+
+
+def import_time(module: str = "Maze", repeat: int = 5) -> float:
+    ''' times a cold import of module in fresh interpreters with -X importtime,
+        which leaves out the interpreter's own startup; a first run writes
+        the bytecode cache, as a deployed install would already have it
+    Returns:
+        the fastest cumulative import time, in seconds
+    '''
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    command = [sys.executable, "-X", "importtime", "-c", f"import {module}"]
+    directory = os.path.dirname(os.path.abspath(__file__))
+    seconds = float("inf")
+    for run in range(repeat + 1):
+        stderr = subprocess.run(command, cwd = directory, env = env, capture_output = True,
+                                text = True, check = True).stderr
+        # the last line is the module itself: "import time: self | cumulative | name"
+        cumulative = int(stderr.strip().splitlines()[-1].split("|")[1])
+        if run > 0:
+            seconds = min(seconds, cumulative / 1e6)
+    return seconds
+
+
+def solvable_maze(size: int, density: float, seed: int,
+                  tries: int = 20) -> Tuple[Optional[Maze], int, float]:
+    ''' builds a square maze with its start and goal in opposite corners,
+        trying seeds from seed upwards until the goal can be reached, so the
+        solvers are timed on real searches; each try labels the maze's
+        components with build_components, which the searches never do on
+        their own, and the labels are kept: with the start and goal joined
+        they only cost the searches an O(1) check
+    Returns:
+        the maze, or None if none of the tries seeds gave a solvable one, the
+        last seed tried, and the seconds build_components took on that maze
+    '''
+    for maze_seed in range(seed, seed + tries):
+        maze = Maze(size, size, density, Position(0, 0), Position(size - 1, size - 1), seed = maze_seed)
+        start = time.perf_counter()
+        maze.build_components()
+        seconds = time.perf_counter() - start
+        if maze.is_reachable(Position(0, 0), Position(size - 1, size - 1)):
+            return maze, maze_seed, seconds
+    return None, maze_seed, seconds
+
+
+def sweep(sizes: List[int], densities: List[float], solvers: List[str], seed: int,
+          repeat: int, memory: bool) -> Iterator[Dict]:
+    ''' yields one result record per (size, density, solver); every solver
+        sees the same maze, from solvable_maze, and a "build_components"
+        record holds the time taken to label it; a size and density for which
+        no solvable maze was found is reported and left out, as every search
+        on it would stop at once '''
+    for size in sizes:
+        for density in densities:
+            maze, maze_seed, components_seconds = solvable_maze(size, density, seed)
+            if maze is None:
+                print(f"skipped {size}x{size} p={density}: no solvable maze for seeds {seed} to {maze_seed}",
+                      file = sys.stderr)
+                continue
+            yield {"solver": "build_components", "rows": size, "cols": size, "prop_blocked": density,
+                   "seed": maze_seed, "seconds": components_seconds, "peak_bytes": None, "count": None,
+                   "path_length": None, "frontier_peak": None}
+            for solver in solvers:
+                record = {"solver": solver, "rows": size, "cols": size, "prop_blocked": density, "seed": maze_seed}
+                record.update(measure(maze, solver, repeat, memory))
+                yield record
+
+
+def key(record: Dict) -> Tuple:
+    return record["solver"], record["rows"], record["cols"], record["prop_blocked"], record["seed"]
+
+
+def compare(results: List[Dict], baseline: List[Dict], tolerance: float, min_seconds: float) -> List[str]:
+    ''' compares results with a baseline run
+    Args:
+        tolerance:    allowed slowdown or memory growth, e.g. 0.25 for 25%
+        min_seconds:  times below this are too noisy to flag
+    Returns:
+        one message per regression: a different count or path length, or a
+        time or peak memory more than tolerance above the baseline
+    '''
+    old = {key(record): record for record in baseline}
+    regressions = []
+    for record in results:
+        before = old.get(key(record))
+        if before is None:
+            continue
+        name = "{} {}x{} p={}".format(record["solver"], record["rows"], record["cols"], record["prop_blocked"])
+        for field in ("count", "path_length"):
+            if record[field] != before[field]:
+                regressions.append(f"{name}: {field} changed from {before[field]} to {record[field]}")
+        for field in ("seconds", "peak_bytes"):
+            if field == "seconds" and record[field] < min_seconds:
+                continue
+            if record[field] is not None and before[field] is not None and \
+                    record[field] > before[field] * (1 + tolerance):
+                regressions.append(f"{name}: {field} rose from {before[field]:.6g} to {record[field]:.6g}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument("--sizes", type = int, nargs = "+", default = SIZES, help = "rows (and cols) of each maze")
+    parser.add_argument("--densities", type = float, nargs = "+", default = DENSITIES, help = "values of prop_blocked")
+    parser.add_argument("--solvers", nargs = "+", default = list(SEARCHES), choices = SEARCHES)
+    parser.add_argument("--seed", type = int, default = 0)
+    parser.add_argument("--repeat", type = positive_int, default = 3, help = "timed runs per solver; the fastest is kept")
+    parser.add_argument("--no-memory", dest = "memory", action = "store_false", help = "skip the tracemalloc run")
+    parser.add_argument("--output", default = "bench_results.json", help = "file to write the results to")
+    parser.add_argument("--baseline", help = "results file from an earlier run to compare against")
+    parser.add_argument("--tolerance", type = float, default = 0.25, help = "allowed slowdown before flagging")
+    parser.add_argument("--min-seconds", type = float, default = 0.001, help = "ignore slowdowns of faster runs")
+    parser.add_argument("--import-time", action = "store_true", help = "only time a cold import of Maze")
+    parser.add_argument("--import-budget", type = float, default = IMPORT_BUDGET, help = "allowed import seconds")
+    args = parser.parse_args()
+
+    if args.import_time:
+        seconds = import_time()
+        print(f"import Maze: {seconds * 1000:.1f} ms (budget {args.import_budget * 1000:.1f} ms)")
+        if seconds > args.import_budget:
+            print("REGRESSION import Maze is over budget")
+            sys.exit(1)
+        return
+
+    results = []
+    for record in sweep(args.sizes, args.densities, args.solvers, args.seed, args.repeat, args.memory):
+        results.append(record)
+        print("{solver:>22} {rows:>5}x{cols:<5} p={prop_blocked:<4} {seconds:9.4f}s count={count} "
+              "length={path_length} frontier={frontier_peak} peak_bytes={peak_bytes}".format(**record))
+
+    with open(args.output, "w") as file:
+        json.dump({"python": platform.python_version(), "results": results}, file, indent = 1)
+
+    if args.baseline is not None:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file)["results"], args.tolerance, args.min_seconds)
+        for message in regressions:
+            print("REGRESSION", message)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+from array import array
+from typing import Optional
+import mmap
+
+from Maze import Maze, Position
+
+
+class DistanceField:
+    ''' breadth first search from one source over a whole maze, storing for
+        every cell only a 1 bit "reached" flag and the 2 bit direction of the
+        step that first reached it, i.e., 3 bits per cell instead of a Node;
+        the field can live in memory or in a memory-mapped file, and the path
+        from the source to any cell is rebuilt from the directions when it
+        is asked for
+
+        The blocked cells are read as bits from the maze's bit-packed mask.
+        For a maze opened by Maze.load that has not been unpacked, that mask
+        is the file's memory map, so with the field in a file as well the
+        search keeps neither the grid nor the field in memory, and grids
+        larger than RAM can be searched. Any other use of the maze's
+        contents (another search, render, set_contents) unpacks them into
+        memory at a byte per cell. '''
+
+    def __init__(self, maze: Maze, source: Optional[Position] = None, path: Optional[str] = None):
+        '''
+        Args:
+            maze:    the maze to search
+            source:  the cell to search from; the maze's start if None
+            path:    file to hold the field, which is created or overwritten;
+                     the field is kept in memory if None
+        Raises:
+            ValueError if the maze is 8-connected, as the 2 bit directions
+            only cover the four straight steps
+        '''
+        if maze._connectivity != 4:
+            raise ValueError("DistanceField searches 4-connected mazes only")
+        self._maze = maze
+        self._source = maze._start_index if source is None else maze._index(source)
+
+        # the buffer holds the packed directions, four cells to a byte,
+        #   followed by the reached bitset, eight cells to a byte with the
+        #   first cell in the most significant bit, as in the blocked mask
+        size = maze._num_rows * maze._num_cols
+        self._reached_base = (size + 3) // 4
+        buffer_size = self._reached_base + (size + 7) // 8
+        if path is None:
+            self._file = None
+            self._buffer = bytearray(buffer_size)
+        else:
+            self._file = open(path, "w+b")
+            self._file.truncate(buffer_size)
+            self._buffer = mmap.mmap(self._file.fileno(), buffer_size)
+
+        # a direction code is the step from a cell's parent to the cell, in
+        #   the maze's south, north, east, west order
+        cols = maze._num_cols
+        self._steps = (cols, -cols, 1, -1)
+        self.count, self.depth = self._fill()
+
+    def _fill(self) -> tuple[int, int]:
+        ''' runs the search one level at a time, keeping each frontier in a
+            compact int array
+        Returns:
+            the number of cells reached and the distance to the farthest one
+        '''
+        maze, buffer, base = self._maze, self._buffer, self._reached_base
+        cols = maze._num_cols
+        row_edges, col_edges = maze._row_edges, maze._col_edges
+        # one bit per cell, set for blocked cells, most significant bit first
+        blocked, blocked_base = maze._blocked_bits()
+
+        # the maze's neighbour table, with the direction code of each offset
+        moves = tuple(tuple((offset, self._steps.index(offset)) for offset in offsets)
+                      for offsets in maze._offsets)
+
+        source = self._source
+        buffer[base + (source >> 3)] |= 128 >> (source & 7)
+        frontier = array('i', [source])
+        count, depth = 1, -1
+        while frontier:
+            depth += 1
+            next_frontier = array('i')
+            for index in frontier:
+                row, col = divmod(index, cols)
+                for offset, code in moves[row_edges[row] | col_edges[col]]:
+                    next_index = index + offset
+                    byte, bit = next_index >> 3, 128 >> (next_index & 7)
+                    if not buffer[base + byte] & bit and not blocked[blocked_base + byte] & bit:
+                        buffer[base + byte] |= bit
+                        buffer[next_index >> 2] |= code << ((next_index & 3) << 1)
+                        next_frontier.append(next_index)
+            count += len(next_frontier)
+            frontier = next_frontier
+        return count, depth
+
+    def _target(self, pos: Optional[Position]) -> int:
+        return self._maze._goal_index if pos is None else self._maze._index(pos)
+
+    def is_reached(self, pos: Optional[Position] = None) -> bool:
+        ''' indicates whether the search reached pos (the maze's goal if None) '''
+        index = self._target(pos)
+        return bool(self._buffer[self._reached_base + (index >> 3)] & (128 >> (index & 7)))
+
+    def path_to(self, pos: Optional[Position] = None) -> array:
+        ''' rebuilds the path from the source to pos (the maze's goal if None)
+        Returns:
+            an int array of buffer indices from source to pos, empty if the
+            search did not reach pos
+        '''
+        if not self.is_reached(pos):
+            return array('i')
+
+        buffer, steps, source = self._buffer, self._steps, self._source
+        index = self._target(pos)
+        path = array('i', [index])
+        while index != source:
+            index -= steps[(buffer[index >> 2] >> ((index & 3) << 1)) & 3]
+            path.append(index)
+        path.reverse()
+        return path
+
+    def distance(self, pos: Optional[Position] = None) -> int:
+        ''' returns the number of steps from the source to pos (the maze's
+            goal if None), or -1 if the search did not reach it '''
+        return len(self.path_to(pos)) - 1
+
+    def close(self) -> None:
+        ''' releases the memory-mapped file, if there is one '''
+        if self._file is not None:
+            self._buffer.close()
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> 'DistanceField':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,292 @@
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from Maze import BLOCKED, Contents, Maze, Position, SearchResult
+from PriorityQueue import IndexedPriorityQueue
+
+
+class HPAStar:
+    ''' hierarchical planner (HPA*) bound to one Maze: the grid is split into
+        square clusters, and every maximal run of open cells along the border
+        of two clusters gets one or two entrances; the distances between the
+        entrances of each cluster are found once, so a query searches the
+        small graph of entrances and then fills in only the cells between
+        the entrances it passes through
+
+        Paths are near-shortest rather than shortest, as they must cross each
+        border at an entrance. Cells are blocked and unblocked through the
+        planner, which then rebuilds only the clusters around the cell. '''
+
+    def __init__(self, maze: Maze, cluster_size: int = 16):
+        '''
+        Args:
+            maze:          the maze to plan on
+            cluster_size:  number of rows and columns in each cluster
+        Raises:
+            ValueError if the maze is 8-connected or cluster_size is below 2
+        '''
+        if maze._connectivity != 4:
+            raise ValueError("HPAStar plans on 4-connected mazes only")
+        if cluster_size < 2:
+            raise ValueError(f"cluster_size must be at least 2, got {cluster_size}")
+        self._maze = maze
+        self._size = cluster_size
+        self._cluster_rows = -(-maze._num_rows // cluster_size)
+        self._cluster_cols = -(-maze._num_cols // cluster_size)
+        num_clusters = self._cluster_rows * self._cluster_cols
+
+        # the (cell, cell) pairs that cross each border, keyed by the numbers
+        #   of the clusters above and below, or left and right, of it
+        self._entrances: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+        # for each cluster, the distances within it between its entrance cells
+        self._intra: List[Dict[int, Dict[int, int]]] = [{} for _ in range(num_clusters)]
+        # for each entrance cell, the cells it crosses a border to
+        self._inter: Dict[int, List[int]] = {}
+        # for each cluster, the paths found inside it between two cells,
+        #   kept until the cluster is rebuilt
+        self._legs: List[Dict[Tuple[int, int], array]] = [{} for _ in range(num_clusters)]
+
+        for cluster in range(num_clusters):
+            for border in self._borders(cluster, lower_right = True):
+                self._build_border(border)
+        for cluster in range(num_clusters):
+            self._build_cluster(cluster)
+
+    def _cluster(self, index: int) -> int:
+        row, col = divmod(index, self._maze._num_cols)
+        return row // self._size * self._cluster_cols + col // self._size
+
+    def _bounds(self, cluster: int) -> Tuple[int, int, int, int]:
+        ''' returns the first row, last row + 1, first col and last col + 1 '''
+        maze, size = self._maze, self._size
+        cluster_row, cluster_col = divmod(cluster, self._cluster_cols)
+        return (cluster_row * size, min(cluster_row * size + size, maze._num_rows),
+                cluster_col * size, min(cluster_col * size + size, maze._num_cols))
+
+    def _borders(self, cluster: int, lower_right: bool = False) -> List[Tuple[int, int]]:
+        ''' returns the keys of the borders of a cluster with its neighbours;
+            with lower_right, only those with the clusters below and right '''
+        cluster_row, cluster_col = divmod(cluster, self._cluster_cols)
+        borders = []
+        if cluster_row + 1 < self._cluster_rows:
+            borders.append((cluster, cluster + self._cluster_cols))
+        if cluster_col + 1 < self._cluster_cols:
+            borders.append((cluster, cluster + 1))
+        if not lower_right:
+            if cluster_row > 0:
+                borders.append((cluster - self._cluster_cols, cluster))
+            if cluster_col > 0:
+                borders.append((cluster - 1, cluster))
+        return borders
+
+    def _build_border(self, border: Tuple[int, int]) -> None:
+        ''' finds the entrances of one border: a run of open cell pairs gets
+            one in its middle, or one at each end if it is 6 or more long '''
+        maze = self._maze
+        contents, cols = maze._contents, maze._num_cols
+        inter = self._inter
+        for a, b in self._entrances.get(border, ()):
+            inter[a].remove(b)
+            inter[b].remove(a)
+
+        first, second = border
+        row_0, row_1, col_0, col_1 = self._bounds(first)
+        if second == first + self._cluster_cols:
+            # first is above second; pairs run along the last row of first
+            pairs = [((row_1 - 1) * cols + col, row_1 * cols + col) for col in range(col_0, col_1)]
+        else:
+            pairs = [(row * cols + col_1 - 1, row * cols + col_1) for row in range(row_0, row_1)]
+
+        entrances = []
+        run: List[Tuple[int, int]] = []
+        for pair in pairs + [None]:
+            if pair is not None and contents[pair[0]] != BLOCKED and contents[pair[1]] != BLOCKED:
+                run.append(pair)
+                continue
+            if len(run) >= 6:
+                entrances += [run[0], run[-1]]
+            elif run:
+                entrances.append(run[len(run) // 2])
+            run = []
+
+        self._entrances[border] = entrances
+        for a, b in entrances:
+            inter.setdefault(a, []).append(b)
+            inter.setdefault(b, []).append(a)
+
+    def _cluster_bfs(self, cluster: int, source: int, targets: Iterable[int]) -> Dict[int, int]:
+        ''' breadth first search from source that stays inside cluster
+        Returns:
+            the number of steps to every cell reached, stopping once all of
+            targets are reached
+        '''
+        maze = self._maze
+        contents, cols = maze._contents, maze._num_cols
+        offsets = maze._offsets
+        row_0, row_1, col_0, col_1 = self._bounds(cluster)
+
+        remaining = set(targets)
+        remaining.discard(source)
+        depths = {source: 0}
+        frontier, steps = [source], 0
+        while frontier and remaining:
+            steps += 1
+            next_frontier = []
+            for index in frontier:
+                row, col = divmod(index, cols)
+                # edge flags relative to the cluster rather than the grid
+                edges = (row == row_1 - 1) | (row == row_0) << 1 | (col == col_1 - 1) << 2 | (col == col_0) << 3
+                for offset in offsets[edges]:
+                    next_index = index + offset
+                    if next_index not in depths and contents[next_index] != BLOCKED:
+                        depths[next_index] = steps
+                        next_frontier.append(next_index)
+                        remaining.discard(next_index)
+            frontier = next_frontier
+        return depths
+
+    def _distances(self, cluster: int, source: int, targets: List[int]) -> Dict[int, int]:
+        ''' returns the number of steps inside cluster from source to each of
+            the targets it can reach '''
+        depths = self._cluster_bfs(cluster, source, targets)
+        return {target: depths[target] for target in targets if target in depths and target != source}
+
+    def _nodes(self, cluster: int) -> List[int]:
+        ''' returns the entrance cells that lie inside cluster '''
+        nodes = set()
+        for border in self._borders(cluster):
+            side = 0 if border[0] == cluster else 1
+            nodes.update(pair[side] for pair in self._entrances[border])
+        return sorted(nodes)
+
+    def _build_cluster(self, cluster: int) -> None:
+        ''' finds the distances within cluster between all of its entrances,
+            searching from each one only for those after it, as the
+            distances are the same both ways '''
+        nodes = self._nodes(cluster)
+        intra: Dict[int, Dict[int, int]] = {node: {} for node in nodes}
+        for i, node in enumerate(nodes):
+            for other, steps in self._distances(cluster, node, nodes[i + 1:]).items():
+                intra[node][other] = intra[other][node] = steps
+        self._intra[cluster] = intra
+        self._legs[cluster] = {}
+
+    def _leg(self, cluster: int, a: int, b: int) -> Tuple[array, int]:
+        ''' finds a shortest path inside cluster from a to b
+        Returns:
+            the path, without a, and the number of cells generated
+        '''
+        maze = self._maze
+        depths = self._cluster_bfs(cluster, b, (a,))
+        leg = array('i')
+        index = a
+        while index != b:
+            index = min((n for n in maze._neighbor_indices(index) if n in depths), key = depths.__getitem__)
+            leg.append(index)
+        return leg, len(depths)
+
+    def _change(self, pos: Position, contents: Contents) -> None:
+        maze = self._maze
+        index = maze._index(pos)
+        if index == maze._start_index or index == maze._goal_index:
+            raise ValueError(f"cannot change the start or goal cell at {pos}")
+        maze.set_contents(pos, contents)
+
+        # the cell's own cluster always changes; a cell on a border also
+        #   changes the entrances of that border, and so the cluster across it
+        cluster = self._cluster(index)
+        changed = {cluster}
+        for border in self._borders(cluster):
+            other = border[1] if border[0] == cluster else border[0]
+            if any(self._cluster(neighbor) == other for neighbor in maze._neighbor_indices(index)):
+                self._build_border(border)
+                changed.add(other)
+        for cluster in changed:
+            self._build_cluster(cluster)
+
+    def block(self, pos: Position) -> None:
+        self._change(pos, Contents.BLOCKED)
+
+    def unblock(self, pos: Position) -> None:
+        self._change(pos, Contents.EMPTY)
+
+    def plan(self, start: Optional[Position] = None, goal: Optional[Position] = None) -> SearchResult:
+        ''' finds a near-shortest path between two cells
+        Args:
+            start:  the cell to start from; the maze's start if None
+            goal:   the cell to reach; the maze's goal if None
+        Returns:
+            a SearchResult whose count is the number of entrances generated
+            by the search of the entrance graph plus the cells generated while
+            joining start and goal to it and filling in the path; its visited
+            mask is None, and its path is empty if goal cannot be reached
+        '''
+        maze = self._maze
+        start = maze._start_index if start is None else maze._index(start)
+        goal = maze._goal_index if goal is None else maze._index(goal)
+        if start == goal:
+            return SearchResult(array('i', [start]), 0, None)
+
+        # join the start and goal to the entrances of their clusters, and to
+        #   each other when they share one
+        start_cluster, goal_cluster = self._cluster(start), self._cluster(goal)
+        start_nodes = self._nodes(start_cluster) + ([goal] if goal_cluster == start_cluster else [])
+        start_edges = self._distances(start_cluster, start, start_nodes)
+        goal_edges = self._distances(goal_cluster, goal, self._nodes(goal_cluster))
+        count = len(start_edges) + len(goal_edges)
+
+        # A* over the entrance graph, with the manhattan distance as heuristic
+        cols = maze._num_cols
+        goal_row, goal_col = divmod(goal, cols)
+        g_scores = {start: 0}
+        parents = {start: -1}
+        to_explore = IndexedPriorityQueue()
+        to_explore.insert((0, 0), start, start)
+        peak = 1
+        while not to_explore.is_empty():
+            if len(to_explore) > peak: peak = len(to_explore)
+            n = to_explore.remove_min()._value
+            if n == goal:
+                break
+
+            if n == start:
+                edges = list(start_edges.items()) + [(m, 1) for m in self._inter.get(n, ())]
+            else:
+                edges = list(self._intra[self._cluster(n)][n].items()) + [(m, 1) for m in self._inter.get(n, ())]
+                if n in goal_edges:
+                    edges.append((goal, goal_edges[n]))
+            for m, cost in edges:
+                g_m = g_scores[n] + cost
+                if g_m < g_scores.get(m, g_m + 1):
+                    count += 1
+                    g_scores[m] = g_m
+                    parents[m] = n
+                    m_row, m_col = divmod(m, cols)
+                    h_m = abs(goal_row - m_row) + abs(goal_col - m_col)
+                    to_explore.update_or_insert(m, (g_m + h_m, h_m), m)
+
+        # the entrance graph joins every pair of cells the grid does, so a
+        #   goal it cannot reach cannot be reached at all
+        if goal not in parents:
+            return SearchResult(array('i'), count, None, peak)
+        abstract = [goal]
+        while parents[abstract[-1]] != -1:
+            abstract.append(parents[abstract[-1]])
+        abstract.reverse()
+
+        # fill in each leg: a border crossing is a single step, and any other
+        #   leg is a breadth first search inside the cluster it lies in
+        path = array('i', [start])
+        for a, b in zip(abstract, abstract[1:]):
+            cluster = self._cluster(a)
+            if self._cluster(b) != cluster:
+                path.append(b)
+                continue
+            leg = self._legs[cluster].get((a, b))
+            if leg is None:
+                leg, generated = self._leg(cluster, a, b)
+                count += generated
+                if a in self._intra[cluster] and b in self._intra[cluster]:
+                    self._legs[cluster][a, b] = leg
+            path.extend(leg)
+        return SearchResult(path, count, None, peak)
@@ -0,0 +1,43 @@
+from typing import Callable, Dict, Optional
+
+Hook = Optional[Callable[[int], None]]
+
+
+class Instruments:
+    ''' optional instrumentation for Maze.search: callbacks for search events
+        and per-phase counters and timers; a search given no Instruments runs
+        its plain loop and pays nothing for any of this
+
+        Every callback is given the buffer index of the cell concerned:
+            on_expand: a cell is about to have its neighbours generated
+            on_push:   a cell was added to the stack, queue or priority queue
+            on_pop:    a cell was taken off it
+            on_goal:   the goal was found
+        A callback may raise an exception to abandon the search. '''
+
+    def __init__(self, on_expand: Hook = None, on_push: Hook = None, on_pop: Hook = None, on_goal: Hook = None):
+        self.on_expand = on_expand
+        self.on_push = on_push
+        self.on_pop = on_pop
+        self.on_goal = on_goal
+
+        self.expanded = 0           # cells whose neighbours were generated
+        self.pushed = 0
+        self.popped = 0
+        self.reopened = 0           # a_star cells given a better g after expansion
+        self.heuristic_calls = 0
+        self.frontier_peak = 0      # most cells held in the frontier at once
+
+        # seconds spent in each phase, and in the whole search
+        self.timers: Dict[str, float] = {"neighbors": 0.0, "frontier": 0.0, "heuristic": 0.0, "total": 0.0}
+
+    def summary(self) -> Dict[str, float]:
+        ''' returns every counter and timer in one flat dict '''
+        counters = {name: getattr(self, name) for name in
+                    ("expanded", "pushed", "popped", "reopened", "heuristic_calls", "frontier_peak")}
+        counters.update({f"{phase}_seconds": seconds for phase, seconds in self.timers.items()})
+        return counters
+
+    def __str__(self) -> str:
+        return ", ".join(f"{name} = {value:.6g}" if isinstance(value, float) else f"{name} = {value}"
+                         for name, value in self.summary().items())
@@ -0,0 +1,127 @@
+from array import array
+from math import inf
+
+from Maze import BLOCKED, Contents, Maze, Position, SearchResult
+from PriorityQueue import IndexedPriorityQueue
+
+
+class LPAStar:
+    ''' incremental planner (Lifelong Planning A*) bound to one Maze; cells are
+        blocked and unblocked through the planner, and plan() then repairs the
+        previous search, re-expanding only the cells whose distance from the
+        start has changed instead of searching the whole maze again
+
+        The first plan() is much slower than a_star: ties on the first key
+        go to the smaller g, so it expands the whole plateau of cells whose
+        f equals the path length rather than heading for the goal. On an
+        open maze at prop_blocked 0.1 it expands about 30k cells (0.8 s) at
+        200x200 and 124k (3 s) at 400x400, against 2.7k and 10.5k for
+        a_star. Use LPAStar when the maze changes and is replanned many
+        times. '''
+
+    def __init__(self, maze: Maze):
+        '''
+        Args:
+            maze: the maze to plan on, whose start and goal stay fixed
+        Raises:
+            ValueError if the maze is 8-connected
+        '''
+        if maze._connectivity != 4:
+            raise ValueError("LPAStar plans on 4-connected mazes only")
+        self._maze = maze
+        self._goal_row, self._goal_col = divmod(maze._goal_index, maze._num_cols)
+
+        # g is the distance found so far, rhs the one-step lookahead value
+        #   min(g(neighbour) + 1); a cell whose two differ is on the open list
+        self._g = array('d', [inf]) * len(maze._contents)
+        self._rhs = array('d', [inf]) * len(maze._contents)
+        self._open = IndexedPriorityQueue()
+
+        start = maze._start_index
+        self._rhs[start] = 0.0
+        self._open.insert(self._key(start), start, start)
+
+    def _key(self, index: int) -> tuple:
+        row, col = divmod(index, self._maze._num_cols)
+        k = min(self._g[index], self._rhs[index])
+        return (k + abs(self._goal_row - row) + abs(self._goal_col - col), k)
+
+    def _update(self, index: int) -> None:
+        ''' recomputes the rhs value of a cell and puts it on, or takes it
+            off, the open list to match '''
+        maze, g = self._maze, self._g
+        contents = maze._contents
+
+        if index != maze._start_index:
+            rhs = inf
+            if contents[index] != BLOCKED:
+                for neighbor in maze._neighbor_indices(index):
+                    if contents[neighbor] != BLOCKED and g[neighbor] + 1 < rhs:
+                        rhs = g[neighbor] + 1
+            self._rhs[index] = rhs
+
+        if g[index] != self._rhs[index]:
+            self._open.update_or_insert(index, self._key(index), index)
+        elif self._open.contains(index):
+            self._open.remove(index)
+
+    def _change(self, pos: Position, contents: Contents) -> None:
+        maze = self._maze
+        index = maze._index(pos)
+        if index == maze._start_index or index == maze._goal_index:
+            raise ValueError(f"cannot change the start or goal cell at {pos}")
+
+        maze.set_contents(pos, contents)
+        self._update(index)
+        for neighbor in maze._neighbor_indices(index):
+            self._update(neighbor)
+
+    def block(self, pos: Position) -> None:
+        self._change(pos, Contents.BLOCKED)
+
+    def unblock(self, pos: Position) -> None:
+        self._change(pos, Contents.EMPTY)
+
+    def plan(self) -> SearchResult:
+        ''' brings the search up to date with every change made since the last
+            call and returns the current shortest path
+        Returns:
+            a SearchResult whose count and visited mask cover only the cells
+            expanded by this call; the first call expands far more cells
+            than a_star, see the class notes
+        '''
+        maze, g, rhs, to_explore = self._maze, self._g, self._rhs, self._open
+        goal = maze._goal_index
+        expanded = bytearray(len(maze._contents))
+        expansions = 0
+
+        while not to_explore.is_empty() and \
+                (to_explore.min()._key < self._key(goal) or rhs[goal] != g[goal]):
+            index = to_explore.remove_min()._value
+            expansions += 1
+            expanded[index] = 1
+
+            if g[index] > rhs[index]:
+                g[index] = rhs[index]
+            else:
+                g[index] = inf
+                self._update(index)
+            for neighbor in maze._neighbor_indices(index):
+                self._update(neighbor)
+
+        return SearchResult(self._path(), expansions, expanded)
+
+    def _path(self) -> array:
+        ''' follows decreasing g values from the goal back to the start '''
+        maze, g = self._maze, self._g
+        contents = maze._contents
+        index = maze._goal_index
+        if g[index] == inf:
+            return array('i')
+
+        path = array('i', [index])
+        while index != maze._start_index:
+            index = min((n for n in maze._neighbor_indices(index) if contents[n] != BLOCKED), key = g.__getitem__)
+            path.append(index)
+        path.reverse()
+        return path
@@ -0,0 +1,82 @@
+''' load test for SolveService: sends requests for random mazes through the
+    in-process LocalClient from many concurrent tasks and reports latency
+    percentiles, throughput and how many requests shared a search; run
+    "python LoadTest.py -h" '''
+
+from typing import List
+import argparse
+import asyncio
+import collections
+import random
+import statistics
+import time
+
+from SolveService import LocalClient, SolveService
+
+
+async def load_test(client: LocalClient, requests: int, concurrency: int, size: int, density: float,
+                    distinct: int, algorithm: str, seed: int) -> List[tuple]:
+    ''' sends requests requests from concurrency tasks at once; the mazes are
+        drawn from distinct seeds, so that concurrent requests for the same
+        maze can be coalesced
+    Returns:
+        a (seconds, status) pair for every request
+    '''
+    rng = random.Random(seed)
+    bodies = [{"rows": size, "cols": size, "prop_blocked": density, "seed": rng.randrange(distinct),
+               "algorithm": algorithm} for _ in range(requests)]
+    queue = collections.deque(bodies)
+    results = []
+
+    async def worker() -> None:
+        while queue:
+            body = queue.popleft()
+            start = time.perf_counter()
+            response = await client.request(body)
+            results.append((time.perf_counter() - start, response["status"]))
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return results
+
+
+async def run(args: argparse.Namespace) -> None:
+    async with SolveService(args.workers, args.max_pending, args.timeout, args.processes, args.max_cells) as service:
+        client = LocalClient(service)
+        start = time.perf_counter()
+        results = await load_test(client, args.requests, args.concurrency, args.size, args.density,
+                                  args.distinct, args.algorithm, args.seed)
+        elapsed = time.perf_counter() - start
+
+    latencies = sorted(seconds for seconds, _ in results)
+    statuses = collections.Counter(status for _, status in results)
+    print(f"{len(results)} requests, concurrency {args.concurrency}: {len(results) / elapsed:.1f} requests/s")
+    # quantiles needs at least two latencies
+    if len(latencies) >= 2:
+        percentiles = statistics.quantiles(latencies, n = 100, method = "inclusive")
+        print(f"p50 {percentiles[49] * 1000:.1f} ms  p99 {percentiles[98] * 1000:.1f} ms  "
+              f"max {latencies[-1] * 1000:.1f} ms")
+    elif latencies:
+        print(f"max {latencies[-1] * 1000:.1f} ms (too few requests for percentiles)")
+    print(f"statuses {dict(statuses)}; coalesced {service.coalesced}, timed out {service.timeouts}, "
+          f"searches stopped {service.cancelled}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument("--requests", type = int, default = 500)
+    parser.add_argument("--concurrency", type = int, default = 32, help = "requests in flight at once")
+    parser.add_argument("--size", type = int, default = 100, help = "rows (and cols) of each maze")
+    parser.add_argument("--density", type = float, default = 0.2, help = "value of prop_blocked")
+    parser.add_argument("--distinct", type = int, default = 100, help = "number of different mazes requested")
+    parser.add_argument("--algorithm", default = "a_star")
+    parser.add_argument("--seed", type = int, default = 0)
+    parser.add_argument("--workers", type = int, default = None, help = "size of the worker pool")
+    parser.add_argument("--max-pending", type = int, default = 64, help = "searches handed to the pool at once")
+    parser.add_argument("--timeout", type = float, default = 30.0, help = "seconds allowed per request")
+    parser.add_argument("--max-cells", type = int, default = 4_000_000, help = "largest maze a request may ask for")
+    parser.add_argument("--processes", action = "store_true", help = "use worker processes rather than threads")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,24 @@
-
-import copy
-
-from Stack import *
-from Queue import *
-from PriorityQueue import *
-
-from copy import deepcopy
+# importing this module must stay cheap and free of side effects: worker
+# processes import it many times over, so the search backends (Stack, Queue,
+# PriorityQueue) and the heavier standard modules (multiprocessing, mmap,
+# random, re) are imported inside the functions that first need them; see
+# import_time in Benchmark.py for the budget; typing is only read by type
+# checkers, as annotations are not evaluated
+from __future__ import annotations
+
+from array import array
+from collections import OrderedDict, namedtuple
 from enum import Enum
-from typing import List, NamedTuple, Optional
-import random
+from math import inf
+import struct
+import sys
+import time
+TYPE_CHECKING = False  # typing.TYPE_CHECKING, without importing typing
+
+if TYPE_CHECKING:
+    import mmap
+    from typing import Callable, Iterable, Iterator, List, Optional, TextIO, Tuple
+    from Instruments import Instruments
 
 
 class Contents(str, Enum):
@@ -23,14 +33,67 @@ class Contents(str, Enum):
     PATH = "★"  # "*"
 
 
-class Position(NamedTuple):
-    row: int
-    col: int
+class Position(namedtuple("Position", "row col")):
+    __slots__ = ()
+
+
+# byte codes used for the flat contents buffer in Maze; the code for a given
+# Contents entry is its position in the enumeration (EMPTY = 0, ..., PATH = 4)
+CONTENTS = tuple(Contents)
+CODES = {contents: code for code, contents in enumerate(CONTENTS)}
+EMPTY, START, GOAL, BLOCKED, PATH = range(len(CONTENTS))
+
+# str.translate table from contents codes (as the characters chr(code)) to
+# the text of a rendered cell: its glyph padded to 2 wide, then the pipe
+GLYPHS = {code: f"{contents.value:2}|" for code, contents in enumerate(CONTENTS)}
+
+# binary maze file format used by Maze.save and Maze.load: magic, version,
+# flags, reserved, rows, cols, start row, start col, goal row, goal col,
+# all little-endian, followed by the bit-packed blocked mask and, when flags
+# has MAZE_COSTS set, one little-endian float32 step cost per cell
+MAZE_HEADER = struct.Struct("<4sBBHIIIIII")
+MAZE_MAGIC = b"MAZE"
+MAZE_VERSION = 1
+MAZE_COSTS = 1
+MAZE_DIAGONAL = 2           # 8-connected
+MAZE_CORNER_CUTTING = 4
+
+# translation tables between contents codes and the ASCII bits of the mask
+BIT_CHARS = bytes(ord("1") if code == BLOCKED else ord("0") for code in range(256))
+BIT_CODES = bytes(BLOCKED if code == ord("1") else EMPTY for code in range(256))
+
+# names of the searches that Maze.search can run
+SEARCHES = ("dfs", "bfs", "a_star", "bidirectional_bfs", "bidirectional_a_star", "jps",
+            "dijkstra", "weighted_a_star")
+INSTRUMENTED_SEARCHES = ("dfs", "bfs", "a_star")
+# the searches that can also move diagonally, in an 8-connected maze
+DIAGONAL_SEARCHES = ("dfs", "bfs", "a_star", "dijkstra", "weighted_a_star")
+# the searches that Maze.multi_search can run
+MULTI_SEARCHES = ("bfs", "a_star")
+# a search given a stop callable calls it once every this many expansions
+CHECK_EVERY = 1024
+
+# cost of a diagonal step in an 8-connected maze, where a straight step costs 1
+SQRT2 = 2 ** 0.5
+
+# translation tables for the visited masks used by the searches: a search
+# starts from a mask in which only blocked cells are set (to 2) and marks the
+# cells it reaches with 1; VISITED_MASK then drops the blocked cells again
+BLOCKED_MASK = bytes(2 if code == BLOCKED else 0 for code in range(256))
+VISITED_MASK = bytes(1 if code == 1 else 0 for code in range(256))
+# the weighted searches also close the cells they expand, setting them to 3
+CLOSED_MASK = bytes(1 if code in (1, 3) else 0 for code in range(256))
+
+# the bidirectional searches share one mask, in which the forward search sets
+# bit 0 and the backward search bit 2 (blocked cells still hold 2)
+FORWARD, BACKWARD = 1, 4
+BIDIRECTIONAL_MASK = bytes(1 if code & (FORWARD | BACKWARD) else 0 for code in range(256))
 
 
 class Cell:
     ''' allows us to use Cell as a data type -- an ordered triple of
-        row, column, cell contents '''
+        row, column, cell contents; a Maze does not store Cell objects, it
+        creates them on request from its contents buffer '''
 
     def __init__(self, row: int, col: int, contents: Contents):
         self._position = Position(row, col)
@@ -73,6 +136,31 @@ class Node:
         return self.cost + self.heuristic < other.cost + other.heuristic
 
 
+class SearchResult:
+    ''' the outcome of one search, kept apart from the Maze so that searching
+        never modifies the grid:
+            path:    buffer indices of the cells from start to goal, empty if
+                     the goal could not be reached
+            count:   number of cells the search generated
+            visited: mask with a 1 for every cell the search reached
+            frontier_peak: largest number of cells the search held in its
+                     stack, queue or priority queue at once '''
+
+    __slots__ = ('path', 'count', 'visited', 'frontier_peak')
+
+    def __init__(self, path: array, count: int, visited: bytearray, frontier_peak: int = 0):
+        self.path = path
+        self.count = count
+        self.visited = visited
+        self.frontier_peak = frontier_peak
+
+    def found(self) -> bool:
+        return len(self.path) > 0
+
+    def __str__(self):
+        return f"SearchResult(length = {len(self.path)}, count = {self.count})"
+
+
 def manhattan(from_: Cell, to_: Cell) -> float:
     ''' the heuristic function for a star'''
 
@@ -81,13 +169,69 @@ def manhattan(from_: Cell, to_: Cell) -> float:
     return row_dist + col_dist
 
 
+def octile(from_: Cell, to_: Cell) -> float:
+    ''' the heuristic function for a star in an 8-connected maze: the cost
+        of the straight and diagonal steps between the cells if none were
+        blocked '''
+    col_dist = abs(to_.get_position().col - from_.get_position().col)
+    row_dist = abs(to_.get_position().row - from_.get_position().row)
+    return row_dist + col_dist + (SQRT2 - 2) * min(row_dist, col_dist)
+
+
+def random_contents(rows: int, cols: int, prop_blocked: float, start: int, goal: int,
+                    seed: Optional[int] = None) -> bytearray:
+    ''' creates a rows x cols contents buffer in which exactly
+        round((rows * cols - 2) * prop_blocked) cells are BLOCKED and the rest
+        EMPTY; the cells at buffer indices start and goal are never blocked
+    Args:
+        seed: seed for the random draw; None draws one from the random module
+    Returns:
+        a bytearray of contents codes, indexed by row * cols + col
+    '''
+    import random
+    rng = random.Random(random.getrandbits(64) if seed is None else seed)
+    size = rows * cols
+    k = round((size - 2) * prop_blocked)
+
+    # block every cell independently with probability threshold / 256 in one
+    #   draw: one random byte per cell, translated to BLOCKED or EMPTY
+    threshold = round(prop_blocked * 256)
+    table = bytes([BLOCKED]) * threshold + bytes([EMPTY]) * (256 - threshold)
+    contents = bytearray(rng.randbytes(size).translate(table))
+    contents[start] = contents[goal] = START  # keep them out of the counts below
+
+    # then clear (or block) randomly chosen cells until exactly k are blocked;
+    #   the draw treats all cells alike, so every set of k cells is equally likely
+    extra = contents.count(BLOCKED) - k
+    wrong, right = (BLOCKED, EMPTY) if extra > 0 else (EMPTY, BLOCKED)
+    need = abs(extra)
+    if need > 0 and contents.count(wrong) * 64 >= size:
+        while need > 0:
+            i = rng.randrange(size)
+            if contents[i] == wrong:
+                contents[i] = right
+                need -= 1
+    elif need > 0:
+        # too few candidates to find by probing; list them instead
+        import re
+        candidates = [match.start() for match in re.finditer(bytes([wrong]), contents)]
+        for i in rng.sample(candidates, need):
+            contents[i] = right
+
+    contents[start] = contents[goal] = EMPTY
+    return contents
+
+
 class Maze:
-    ''' class representing a 2D maxe of Cell objects '''
+    ''' class representing a 2D maze; rather than holding a Cell object per
+        square, the contents of every cell are stored as a single byte in a
+        flat bytearray indexed by row * cols + col '''
 
     _order = 0
 
     def __init__(self, rows: int = 10, cols: int = 10, prop_blocked: float = 0.2, start: Position = Position(0, 0),
-                 goal: Position = Position(9, 9)):
+                 goal: Position = Position(9, 9), seed: Optional[int] = None,
+                 costs: Optional[Iterable[float]] = None, connectivity: int = 4, corner_cutting: bool = False):
         '''
         Args:
             rows:          number of rows in the grid
@@ -95,49 +239,507 @@ class Maze:
             prop_blocked:  proportion of cells to be blocked
             start:         tuple indicating the (row,col) of the start cell
             goal:          tuple indicating the (row,col) of the goal cell
+            seed:          seed for placing the blocks; the same seed always
+                           gives the same maze, and None draws a seed from
+                           the random module
+            costs:         cost of stepping onto each cell, in buffer order
+                           (row * cols + col), for the dijkstra and
+                           weighted_a_star searches; None for a cost of 1
+                           everywhere
+            connectivity:  4 to move only north, south, east and west, or 8
+                           to also move diagonally, at a cost of sqrt(2)
+                           times a straight step; see DIAGONAL_SEARCHES
+            corner_cutting: in an 8-connected maze, whether a diagonal step
+                           may pass one blocked corner; it may never pass
+                           between two, and without corner_cutting both of
+                           the cells beside it must be open
+        Raises:
+            ValueError if connectivity is neither 4 nor 8
         '''
+        self._setup(rows, cols, start, goal, connectivity, corner_cutting)
+        self.set_costs(costs)
+
+        # create the rows x cols contents buffer with blocks at random spots,
+        #   using the given proportion, then set the start and goal cells
+        self._contents = random_contents(rows, cols, prop_blocked, self._start_index, self._goal_index, seed)
+        self._contents[self._start_index] = START
+        self._contents[self._goal_index] = GOAL
+
+    def _setup(self, rows: int, cols: int, start: Position, goal: Position,
+               connectivity: int = 4, corner_cutting: bool = False) -> None:
+        ''' sets up everything but the contents buffer, for both __init__ and load '''
+        if connectivity not in (4, 8):
+            raise ValueError(f"connectivity must be 4 or 8, got {connectivity}")
         self._num_rows = rows
         self._num_cols = cols
+        self._connectivity = connectivity
+        self._corner_cutting = corner_cutting
         self._start = Cell(start.row, start.col, Contents.START)
         self._goal = Cell(goal.row, goal.col, Contents.GOAL)
+        self._start_index = self._index(start)
+        self._goal_index = self._index(goal)
 
-        # create a rows x cols 2D list of Cell objects, intially all empty
-        self._grid: List[List[Cell]] = \
-            [[Cell(r, c, Contents.EMPTY) for c in range(cols)] for r in range(rows)]
-
-        # set the start and goal cells
-        self._grid[start.row][start.col] = self._start
-        self._grid[goal.row][goal.col] = self._goal
-
-        # put blocks at random spots in the grid, using given proportion;
-        # start by creating a collapsed 1D version of the grid, then
-        #   remove the start and goal, and then randomly pick cells to block;
-        # note that we are using identical object references in both
-        #   options and self._grid so that updates to options will be seen
-        #   in self._grid (i.e., options is not a deep copy of cells)
+        self._build_neighbor_table()
 
-        options = [cell for row in self._grid for cell in row]
-        options.remove(self._start)
-        options.remove(self._goal)
-        blocked = random.sample(options, k = round((rows * cols - 2) * prop_blocked))
-        for b in blocked: b._contents = Contents.BLOCKED
+        # connected component labels, built only when asked for, by
+        #   build_components or is_reachable; searches use them when present
+        self._components: Optional[array] = None
+        self._component_roots: List[int] = []
 
+        # state for shortest_path queries: an LRU cache of (path, count) pairs
+        #   keyed by (start, goal) index, and the landmark distance tables
+        self._query_cache: OrderedDict = OrderedDict()
+        self._query_cache_size = 128
+        self._landmarks: List[array] = []
 
-        # pos = [(1,0),(1,3),(2,1),(2,4),(3,2),(5,1),(5,3),(5,4)]
+    def set_costs(self, costs: Optional[Iterable[float]]) -> None:
+        ''' sets the cost of stepping onto each cell, which the dijkstra and
+            weighted_a_star searches minimise (the other searches count steps)
+        Args:
+            costs: one cost per cell in buffer order, or None for a cost of 1
+                   everywhere; stored as float32
+        Raises:
+            ValueError if there is not one cost per cell, or a cost is not a
+            positive finite number
         '''
-        pos = [(1, 1), (1, 3), (2, 4), (3, 2), (5, 1), (5, 3), (5, 4)]
-        for p in pos:
-            self._grid[p[0]][p[1]]._contents = Contents.BLOCKED
+        if costs is None:
+            self._costs: Optional[array] = None
+            self._min_cost = 1.0
+            return
+        costs = array('f', costs)
+        if len(costs) != self._num_rows * self._num_cols:
+            raise ValueError(f"expected {self._num_rows * self._num_cols} costs, got {len(costs)}")
+        if not all(0 < cost < inf for cost in costs):
+            raise ValueError("costs must be positive finite numbers")
+        self._costs = costs
+        self._min_cost = min(costs)
+
+    def save(self, path: str) -> None:
+        ''' writes the maze to a file in the binary maze format: a header
+            (see MAZE_HEADER) with the dimensions, start and goal, followed by
+            one bit per cell, set for blocked cells, in buffer order with the
+            most significant bit of each byte first, then the costs, if set '''
+        flags = (0 if self._costs is None else MAZE_COSTS) | (MAZE_DIAGONAL if self._connectivity == 8 else 0) \
+            | (MAZE_CORNER_CUTTING if self._corner_cutting else 0)
+        header = MAZE_HEADER.pack(MAZE_MAGIC, MAZE_VERSION, flags, 0, self._num_rows, self._num_cols,
+                                  *self._start.get_position(), *self._goal.get_position())
+        with open(path, "wb") as file:
+            file.write(header)
+            file.write(self._pack_blocked())
+            if self._costs is not None:
+                costs = self._costs
+                if sys.byteorder == "big":
+                    costs = array('f', costs)
+                    costs.byteswap()
+                file.write(costs.tobytes())
+
+    def _pack_blocked(self) -> bytes:
+        ''' returns the blocked mask of the file format: one bit per cell, set
+            for blocked cells, most significant bit first '''
+        bits = self._contents.translate(BIT_CHARS)
+        bits += b"0" * (-len(bits) % 8)
+        return int(bits, 2).to_bytes(len(bits) // 8, "big")
+
+    def _blocked_bits(self) -> Tuple['bytes|mmap.mmap', int]:
+        ''' returns a buffer holding the blocked mask of the file format and
+            the offset of the mask in it; for a maze opened by load whose
+            contents have not been unpacked, this is the file's memory map,
+            so the mask is read from the file rather than unpacked into
+            memory at a byte per cell '''
+        packed = self.__dict__.get("_packed")
+        if packed is not None:
+            return packed, MAZE_HEADER.size
+        return self._pack_blocked(), 0
+
+    @classmethod
+    def load(cls, path: str) -> 'Maze':
+        ''' opens a maze written by save; the file is memory-mapped and only
+            its header is read, so this takes the same time for any size of
+            maze; the contents buffer and costs are unpacked the first time
+            either is needed
+        Raises:
+            ValueError if the file is not a maze file, is truncated, or its
+            header gives an empty maze or a start or goal outside the maze
         '''
+        import mmap
+        with open(path, "rb") as file:
+            packed = mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ)
+        # the header is checked in full here, so that a bad file fails now
+        #   rather than on its first search, and its map is not left open
+        try:
+            if len(packed) < MAZE_HEADER.size:
+                raise ValueError(f"{path} is not a maze file")
+            magic, version, flags, _, rows, cols, start_row, start_col, goal_row, goal_col = \
+                MAZE_HEADER.unpack_from(packed)
+            if magic != MAZE_MAGIC or version != MAZE_VERSION:
+                raise ValueError(f"{path} is not a maze file")
+            if rows < 1 or cols < 1:
+                raise ValueError(f"{path} holds a {rows}x{cols} maze")
+            if not (start_row < rows and goal_row < rows and start_col < cols and goal_col < cols):
+                raise ValueError(f"{path} puts the start ({start_row}, {start_col}) or goal ({goal_row}, {goal_col}) "
+                                 f"outside its {rows}x{cols} maze")
+            size = MAZE_HEADER.size + (rows * cols + 7) // 8
+            if flags & MAZE_COSTS:
+                size += rows * cols * 4
+            if len(packed) < size:
+                raise ValueError(f"{path} is truncated")
+        except ValueError:
+            packed.close()
+            raise
+
+        maze = cls.__new__(cls)
+        maze._setup(rows, cols, Position(start_row, start_col), Position(goal_row, goal_col),
+                    8 if flags & MAZE_DIAGONAL else 4, bool(flags & MAZE_CORNER_CUTTING))
+        maze._packed = packed
+        maze._packed_flags = flags
+        return maze
+
+    def __getattr__(self, name: str):
+        ''' only called for attributes that are not set; unpacks the contents
+            buffer and costs of a maze opened by load the first time either
+            is used '''
+        packed = self.__dict__.get("_packed")
+        if name not in ("_contents", "_costs", "_min_cost") or packed is None:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+        size = self._num_rows * self._num_cols
+        num_bytes = (size + 7) // 8
+        bits = format(int.from_bytes(packed[MAZE_HEADER.size:MAZE_HEADER.size + num_bytes], "big"), f"0{num_bytes * 8}b")
+        contents = bytearray(bits[:size].encode().translate(BIT_CODES))
+        contents[self._start_index] = START
+        contents[self._goal_index] = GOAL
+        self._contents = contents
+
+        costs = None
+        if self._packed_flags & MAZE_COSTS:
+            offset = MAZE_HEADER.size + num_bytes
+            costs = array('f', packed[offset:offset + size * 4])
+            if sys.byteorder == "big":
+                costs.byteswap()
+        self.set_costs(costs)
+
+        del self._packed, self._packed_flags
+        packed.close()
+        return getattr(self, name)
+
+    def __getstate__(self) -> dict:
+        # a memory map cannot be copied or pickled, so unpack it first
+        if "_packed" in self.__dict__:
+            self._contents
+        return self.__dict__.copy()
+
     def __str__(self) -> str:
+        return self.render()
+
+    def render(self, path: Optional[Iterable[int]] = None,
+               viewport: Optional[Tuple[Position, Position]] = None) -> str:
         ''' returns a str version of the maze, showing contents, with cells
-            deliminted by vertical pipes '''
-        maze_str = ""
-        for row in self._grid:  # row : List[Cell]
-            maze_str += "|" \
-                        + "|".join([f"{int(cell._contents):2}" if not isinstance(cell._contents, str) else \
-                                        f"{cell._contents:2}" for cell in row]) + "|\n"
-        return maze_str[:-1]  # remove the final \n
+            deliminted by vertical pipes; the cells of path, other than the
+            start and goal, are drawn as Contents.PATH without changing the maze
+        Args:
+            path:      buffer indices of a path to overlay, e.g. SearchResult.path
+            viewport:  the top left and bottom right cells (inclusive) of the
+                       part of the maze to draw, e.g. from viewport; all of
+                       it if None
+        '''
+        return "\n".join(self.render_rows(path, viewport))
+
+    def render_rows(self, path: Optional[Iterable[int]] = None,
+                    viewport: Optional[Tuple[Position, Position]] = None) -> Iterator[str]:
+        ''' yields the rows of render one at a time, without the newlines, so
+            that a maze of any size can be written out without building it
+            as one str; each row is translated from the contents buffer in
+            one call through GLYPHS '''
+        contents, cols = self._contents, self._num_cols
+        if viewport is None:
+            viewport = Position(0, 0), Position(self._num_rows - 1, cols - 1)
+        (top, left), (bottom, right) = viewport
+
+        # the path cells inside the viewport, by row
+        overlay: dict = {}
+        for i in path if path is not None else ():
+            row, col = divmod(i, cols)
+            if top <= row <= bottom and left <= col <= right:
+                overlay.setdefault(row, []).append(col - left)
+
+        for row in range(top, bottom + 1):
+            line = contents[row * cols + left:row * cols + right + 1]
+            for col in overlay.get(row, ()):
+                if line[col] != START and line[col] != GOAL:
+                    line[col] = PATH
+            yield "|" + line.decode("latin-1").translate(GLYPHS)
+
+    def write(self, file: TextIO, path: Optional[Iterable[int]] = None,
+              viewport: Optional[Tuple[Position, Position]] = None) -> None:
+        ''' writes render to an open text file a row at a time, ending with a
+            newline '''
+        for line in self.render_rows(path, viewport):
+            file.write(line)
+            file.write("\n")
+
+    def viewport(self, path: Iterable[int], margin: int = 2) -> Tuple[Position, Position]:
+        ''' returns the top left and bottom right cells of the smallest box
+            holding every cell of path, grown by margin cells on each side and
+            clipped to the maze, for render's viewport; the whole maze if path
+            is empty '''
+        rows, cols = zip(*(divmod(i, self._num_cols) for i in path)) if path else ((), ())
+        if not rows:
+            return Position(0, 0), Position(self._num_rows - 1, self._num_cols - 1)
+        return (Position(max(min(rows) - margin, 0), max(min(cols) - margin, 0)),
+                Position(min(max(rows) + margin, self._num_rows - 1), min(max(cols) + margin, self._num_cols - 1)))
+
+    def _index(self, pos: Position) -> int:
+        ''' converts a (row, col) position into an index into the contents buffer '''
+        return pos.row * self._num_cols + pos.col
+
+    def _cell(self, index: int) -> Cell:
+        ''' creates a Cell view of the contents buffer at the given index '''
+        row, col = divmod(index, self._num_cols)
+        return Cell(row, col, CONTENTS[self._contents[index]])
+
+    def get_cell(self, pos: Position) -> Cell:
+        return self._cell(self._index(pos))
+
+    def set_contents(self, pos: Position, contents: Contents) -> None:
+        index = self._index(pos)
+        was_blocked = self._contents[index] == BLOCKED
+        self._contents[index] = CODES[contents]
+        if self._blocked_sides is not None:
+            self._blocked_sides[index + self._num_cols] = 2 if contents == Contents.BLOCKED else 0
+
+        # keep the component labels correct: opening a cell can only join
+        #   components, which the union-find handles in place, but blocking
+        #   one may split a component, so the labels are dropped until the
+        #   next build_components or is_reachable
+        if was_blocked != (contents == Contents.BLOCKED):
+            if self._components is not None:
+                if was_blocked:
+                    self._join_components(index)
+                else:
+                    self._components = None
+
+            # cached paths and landmark distances may no longer hold
+            self._query_cache.clear()
+            self._landmarks = []
+
+    def _label_components(self) -> None:
+        ''' labels every open cell with the number of its connected component,
+            using one flood fill per component; blocked cells get -1 '''
+        cols = self._num_cols
+        offsets, row_edges, col_edges = self._offsets, self._row_edges, self._col_edges
+        diagonal, open_diagonals = self._connectivity == 8, self._open_diagonals
+        labelled = self._contents.translate(BLOCKED_MASK)
+        labels = array('i', [-1]) * len(labelled)
+
+        label = 0
+        seed = labelled.find(0)
+        while seed != -1:
+            labelled[seed] = 1
+            labels[seed] = label
+            frontier = [seed]
+            while frontier:
+                next_frontier = []
+                for index in frontier:
+                    row, col = divmod(index, cols)
+                    edges = row_edges[row] | col_edges[col]
+                    for offset in offsets[edges] + open_diagonals(index, edges) if diagonal else offsets[edges]:
+                        next_index = index + offset
+                        if not labelled[next_index]:
+                            labelled[next_index] = 1
+                            labels[next_index] = label
+                            next_frontier.append(next_index)
+                frontier = next_frontier
+            label += 1
+            seed = labelled.find(0, seed)
+
+        self._components = labels
+        self._component_roots = list(range(label))
+
+    def _find_component(self, label: int) -> int:
+        ''' returns the representative label of the component holding label,
+            halving the union-find path on the way '''
+        roots = self._component_roots
+        while roots[label] != label:
+            roots[label] = roots[roots[label]]
+            label = roots[label]
+        return label
+
+    def _join_components(self, index: int) -> None:
+        ''' gives a newly opened cell a label, merging the components of all
+            of its open neighbours into one '''
+        labels, roots = self._components, self._component_roots
+        label = len(roots)
+        roots.append(label)
+        labels[index] = label
+        for offset in self._moves(index):
+            if labels[index + offset] != -1:
+                roots[self._find_component(labels[index + offset])] = label
+
+    def build_components(self) -> None:
+        ''' labels the connected components of the maze, unless the labels are
+            already built; this fills the whole grid once, after which
+            is_reachable is O(1) and the searches return at once when the
+            start and goal lie in different components; the labels survive
+            unblocking cells but are dropped when a cell is blocked '''
+        if self._components is None:
+            self._label_components()
+
+    def is_reachable(self, a: Position, b: Position) -> bool:
+        ''' indicates whether a path joins the cells at a and b; builds the
+            component labels first if need be '''
+        self.build_components()
+        return self._connected(self._index(a), self._index(b))
+
+    def _connected(self, a: int, b: int) -> bool:
+        ''' indicates whether the component labels join buffer indices a and
+            b; the labels must be built '''
+        label_a, label_b = self._components[a], self._components[b]
+        if label_a == -1 or label_b == -1:
+            return False
+        return self._find_component(label_a) == self._find_component(label_b)
+
+    def _separated(self, a: int, b: int) -> bool:
+        ''' indicates whether buffer indices a and b are known to lie in
+            different components; always False while the labels are not
+            built, as no search fills the grid just to find out '''
+        return self._components is not None and not self._connected(a, b)
+
+    def _bfs_distances(self, source: int) -> array:
+        ''' returns the number of steps from the cell at index source to every
+            cell in the maze, -1 for the cells it cannot reach '''
+        cols = self._num_cols
+        offsets, row_edges, col_edges = self._offsets, self._row_edges, self._col_edges
+        diagonal, open_diagonals = self._connectivity == 8, self._open_diagonals
+        visited = self._contents.translate(BLOCKED_MASK)
+        distances = array('i', [-1]) * len(visited)
+
+        visited[source] = 1
+        distances[source] = 0
+        frontier, steps = [source], 0
+        while frontier:
+            steps += 1
+            next_frontier = []
+            for index in frontier:
+                row, col = divmod(index, cols)
+                edges = row_edges[row] | col_edges[col]
+                for offset in offsets[edges] + open_diagonals(index, edges) if diagonal else offsets[edges]:
+                    next_index = index + offset
+                    if not visited[next_index]:
+                        visited[next_index] = 1
+                        distances[next_index] = steps
+                        next_frontier.append(next_index)
+            frontier = next_frontier
+        return distances
+
+    def distance_field(self, source: Optional[Position] = None, path: Optional[str] = None):
+        ''' runs a breadth first search that keeps only a 3 bit per cell
+            DistanceField, optionally in a memory-mapped file; see DistanceField.py '''
+        from DistanceField import DistanceField
+        return DistanceField(self, source, path)
+
+    def build_landmarks(self, count: int = 8) -> None:
+        ''' precomputes the distances from count landmark cells to every cell,
+            picked so that each is as far as possible from those before it;
+            A* then bounds the distance from a cell v to a goal t below by
+            |d(L, t) - d(L, v)| for each landmark L, which is never less than
+            the manhattan distance and often much closer to the true one; the
+            tables take 4 * count bytes per cell and are dropped whenever a
+            cell is blocked or unblocked
+        '''
+        landmarks = []
+        if count > 0:
+            # start from the cell farthest from the start, then repeatedly add
+            #   the cell farthest from every landmark chosen so far
+            nearest = self._bfs_distances(self._start_index)
+            while len(landmarks) < count:
+                farthest = max(range(len(nearest)), key = nearest.__getitem__)
+                if nearest[farthest] <= 0:
+                    break
+                table = self._bfs_distances(farthest)
+                landmarks.append(table)
+                nearest = array('i', map(min, nearest, table))
+
+        self._landmarks = landmarks
+        self._query_cache.clear()
+
+    def set_query_cache_size(self, size: int) -> None:
+        ''' sets how many shortest_path results are kept, evicting the least
+            recently used ones beyond that '''
+        self._query_cache_size = size
+        while len(self._query_cache) > size:
+            self._query_cache.popitem(last = False)
+
+    def shortest_path(self, a: Position, b: Position) -> SearchResult:
+        ''' finds a shortest path between any two cells with A*, using the
+            landmark tables if build_landmarks has been called; results are
+            kept in an LRU cache, and a query for b to a reuses a cached a to b
+        Returns:
+            a SearchResult; visited is None, as the cache only keeps the path
+            and the count
+        '''
+        start, goal = self._index(a), self._index(b)
+        cache = self._query_cache
+
+        if (start, goal) in cache:
+            cache.move_to_end((start, goal))
+            path, count = cache[(start, goal)]
+            return SearchResult(path, count, None)
+        if (goal, start) in cache:
+            cache.move_to_end((goal, start))
+            path, count = cache[(goal, start)]
+            path = array('i', reversed(path))
+            return SearchResult(path, count, None)
+
+        if self._separated(start, goal):
+            path, count = array('i'), 0
+        else:
+            result = self._a_star(start, goal)
+            path, count = result.path, result.count
+
+        if self._query_cache_size > 0:
+            cache[(start, goal)] = (path, count)
+            if len(cache) > self._query_cache_size:
+                cache.popitem(last = False)
+        return SearchResult(path, count, None)
+
+    def multi_search(self, sources: Iterable[Position], goals: Iterable[Position],
+                     algorithm: str = "bfs") -> Tuple[SearchResult, Optional[Position]]:
+        ''' finds a shortest path from any of sources to the nearest of goals
+            in one search, rather than one search per pair; the maze's own
+            start and goal are not used
+        Args:
+            sources:    cells to search from; blocked ones are ignored
+            goals:      cells to search for; blocked ones are ignored
+            algorithm:  one of the names in MULTI_SEARCHES; a_star uses the
+                        smallest distance to any goal as its heuristic
+        Returns:
+            a SearchResult whose path runs from a source to the goal reached,
+            and that goal, or None with an empty result if no goal can be
+            reached from any source
+        Raises:
+            ValueError for an unknown algorithm
+        '''
+        if algorithm not in MULTI_SEARCHES:
+            raise ValueError(f"unknown search algorithm '{algorithm}', expected one of {MULTI_SEARCHES}")
+        contents = self._contents
+        sources = {self._index(pos) for pos in sources}
+        goals = {self._index(pos) for pos in goals}
+        sources = [i for i in sorted(sources) if contents[i] != BLOCKED]
+
+        goals = [i for i in sorted(goals) if contents[i] != BLOCKED]
+        # with the component labels built, drop the goals outside every
+        #   source's component, so the search neither runs on when none can
+        #   be reached nor steers towards them
+        if self._components is not None:
+            labels = {self._find_component(self._components[i]) for i in sources}
+            goals = [i for i in goals if self._find_component(self._components[i]) in labels]
+        if not goals:
+            return SearchResult(array('i'), 0, bytearray(len(contents))), None
+
+        result = self._multi_bfs(sources, goals) if algorithm == "bfs" else self._multi_a_star(sources, goals)
+        if not result.found():
+            return result, None
+        return result, self._cell(result.path[-1]).get_position()
 
     def get_start(self):
         return self._start
@@ -146,134 +748,819 @@ class Maze:
         return self._goal
 
     def get_search_locations(self, cell: Cell) -> List[Cell]:
-        cell_list = []
-        invalid_cells = [self._start]
-        grid = self._grid
-        '''
-        for cells in grid:
-            for ccell in cells:
-                if ccell.is_blocked() == True:
-                    invalid_cells.append(ccell)
-        '''
-        row = cell._position[0]
-        col = cell._position[1]
-
-        if row == self._num_rows - 1:
-            pass
-        else:
-            s_cell = grid[row + 1][col]
-            if s_cell.is_blocked(): invalid_cells.append(s_cell)
-            if s_cell not in invalid_cells:
-                cell_list.append(s_cell)
-                invalid_cells.append(s_cell)
-            if s_cell.is_blocked: invalid_cells.append(s_cell)
-
-        if row == 0:
+        return [self._cell(i) for i in self._search_indices(self._index(cell._position))]
+
+    def _build_neighbor_table(self) -> None:
+        ''' precomputes the buffer offsets of the neighbours of a cell, in
+            south, north, east, west order, for each combination of grid edges
+            the cell can sit on; _offsets[_row_edges[row] | _col_edges[col]]
+            then gives the in-bounds neighbour offsets of any cell, and
+            _diagonal_moves[edges][sides] the offsets of the diagonal
+            neighbours of an 8-connected maze that the corner rule opens, in
+            south east, south west, north east, north west order, where the
+            bits of sides flag the blocked straight neighbours the same way
+            as the edge flags '''
+        rows, cols = self._num_rows, self._num_cols
+
+        # edge flags: 1 = last row, 2 = first row, 4 = last column, 8 = first column
+        self._row_edges = bytes((r == rows - 1) | (r == 0) << 1 for r in range(rows))
+        self._col_edges = bytes((c == cols - 1) << 2 | (c == 0) << 3 for c in range(cols))
+        steps = ((1, cols), (2, -cols), (4, 1), (8, -1))
+        self._offsets = tuple(tuple(offset for flag, offset in steps if not edges & flag)
+                              for edges in range(16))
+
+        # a diagonal step passes the two straight neighbours whose edge flags
+        #   make up its own, and is open while fewer than limit are blocked
+        diagonals = ((1 | 4, cols + 1), (1 | 8, cols - 1), (2 | 4, 1 - cols), (2 | 8, -1 - cols))
+        limit = 2 if self._corner_cutting else 1
+        self._diagonal_moves = tuple(tuple(tuple(offset for flags, offset in diagonals
+                                                 if not edges & flags and bin(sides & flags).count("1") < limit)
+                                           for sides in range(16))
+                                     for edges in range(16))
+
+        # 1 for each blocked cell, with a row of padding at either end so
+        #   that the straight neighbours of any cell can be read without
+        #   bounds checks; built on first use by _open_diagonals
+        self._blocked_sides: Optional[bytearray] = None
+
+    def _open_diagonals(self, index: int, edges: int) -> tuple:
+        ''' returns the offsets of the diagonal neighbours of the given index
+            that the corner rule lets a step reach, blocked or not; edges are
+            the index's edge flags '''
+        cols, blocked = self._num_cols, self._blocked_sides
+        if blocked is None:
+            blocked = self._blocked_sides = bytearray(cols) + self._contents.translate(BLOCKED_MASK) + bytearray(cols)
+        index += cols
+        return self._diagonal_moves[edges][blocked[index + cols] >> 1 | blocked[index - cols]
+                                           | blocked[index + 1] << 1 | blocked[index - 1] << 2]
+
+    def _moves(self, index: int) -> tuple:
+        ''' returns the offsets of every neighbour a step from the given index
+            can reach, blocked or not: south, north, east, west, then the
+            open diagonals of an 8-connected maze '''
+        row, col = divmod(index, self._num_cols)
+        edges = self._row_edges[row] | self._col_edges[col]
+        if self._connectivity == 8:
+            return self._offsets[edges] + self._open_diagonals(index, edges)
+        return self._offsets[edges]
+
+    def _step_cost(self, a: int, b: int) -> float:
+        ''' the length of the step between neighbours a and b: 1, or sqrt(2)
+            for a diagonal step '''
+        (row_a, col_a), (row_b, col_b) = divmod(a, self._num_cols), divmod(b, self._num_cols)
+        return SQRT2 if row_a != row_b and col_a != col_b else 1.0
+
+    def _heuristic(self, cell: Cell) -> float:
+        ''' the a star heuristic from cell to the goal, for the connectivity '''
+        return octile(cell, self._goal) if self._connectivity == 8 else manhattan(cell, self._goal)
+
+    def _neighbor_indices(self, index: int) -> List[int]:
+        ''' returns the buffer indices of every neighbour of the given index,
+            blocked or not, in the order of _moves '''
+        return [index + offset for offset in self._moves(index)]
+
+    def _search_indices(self, index: int) -> List[int]:
+        ''' returns the buffer indices of the cells reachable in one step from
+            the given index, in the order of _moves; blocked cells and the
+            start cell are never returned '''
+        contents = self._contents
+        return [index + offset for offset in self._moves(index)
+                if contents[index + offset] != BLOCKED and contents[index + offset] != START]
+
+    def _trace(self, parents: array, index: int) -> array:
+        ''' returns the buffer indices from the start of a search to the given
+            index by following the parent indices recorded during the search '''
+        path = array('i')
+        while index != -1:
+            path.append(index)
+            index = parents[index]
+        path.reverse()
+        return path
+
+    def _node_path(self, result: SearchResult, costs: bool = False, weighted: bool = False) -> Optional[Node]:
+        ''' builds the chain of Node objects for the path of a search result,
+            returning the goal Node, or None if the search failed; with costs,
+            each Node also gets its cost from the start and its heuristic,
+            measured as the search measured them: by the cell costs when
+            weighted, and by step lengths alone otherwise '''
+        node = None
+        scale = self._min_cost if weighted else 1.0
+        for g, i in zip(self._path_costs(result.path, weighted), result.path):
+            cell = self._cell(i)
+            if costs:
+                node = Node(cell, node, g, self._heuristic(cell) * scale)
+            else:
+                node = Node(cell, node, None, None)
+        return node
+
+    def _path_costs(self, path: Iterable[int], weighted: bool = True) -> Iterator[float]:
+        ''' yields the cost from the start of path to each of its cells; the
+            length of each step, times the cost of the cell stepped onto when
+            weighted '''
+        costs = self._costs if weighted else None
+        g, previous = 0.0, None
+        for i in path:
+            if previous is not None:
+                g += self._step_cost(previous, i) * (1.0 if costs is None else costs[i])
+            previous = i
+            yield g
+
+    def path_cost(self, path: Iterable[int]) -> float:
+        ''' the total cost of a path of buffer indices, such as
+            SearchResult.path: the sum of the costs of every cell stepped onto
+            after the first, times sqrt(2) for diagonal steps, which is its
+            length - 1 for a 4-connected maze with no costs set '''
+        g = 0.0
+        for g in self._path_costs(path):
             pass
-        else:
-            n_cell = grid[row - 1][col]
-            if n_cell.is_blocked(): invalid_cells.append(n_cell)
-            if n_cell not in invalid_cells:
-                cell_list.append(n_cell)
-                invalid_cells.append(n_cell)
+        return g
 
-        if col == self._num_cols - 1:
-            pass
-        else:
-            e_cell = grid[row][col + 1]
-            if e_cell.is_blocked(): invalid_cells.append(e_cell)
-            if e_cell not in invalid_cells:
-                cell_list.append(e_cell)
-                invalid_cells.append(e_cell)
-
-        if col == 0:
-            pass
-        else:
-            w_cell = grid[row][col - 1]
-            if w_cell.is_blocked(): invalid_cells.append(w_cell)
-            if w_cell not in invalid_cells:
-                cell_list.append(w_cell)
-                invalid_cells.append(w_cell)
+    def _found(self, result: SearchResult, costs: bool = False, weighted: bool = False) -> Optional[tuple[Node, int]]:
+        if not result.found():
+            return None
+        return self._node_path(result, costs, weighted), result.count
 
-        return cell_list
+    def search(self, algorithm: str = "a_star", instruments: 'Instruments' = None,
+               epsilon: float = 2.0, stop: Optional[Callable[[], None]] = None) -> SearchResult:
+        ''' runs one of the searches without touching the grid, so any number
+            of searches can share one Maze
+        Args:
+            algorithm:    one of the names in SEARCHES
+            instruments:  an Instruments object to call at each search event
+                          and to collect counters and phase timers in; only
+                          for the searches in INSTRUMENTED_SEARCHES
+            epsilon:      heuristic inflation for weighted_a_star, at least 1
+            stop:         called with no arguments once every CHECK_EVERY
+                          expansions; it stops the search by raising, and
+                          search passes the exception on
+        Returns:
+            a SearchResult holding the path, count and visited mask; when
+            build_components has run and the start and goal lie in different
+            components, the search is skipped and the result is empty
+        '''
+        if algorithm not in SEARCHES:
+            raise ValueError(f"unknown search algorithm '{algorithm}', expected one of {SEARCHES}")
+        if self._connectivity == 8 and algorithm not in DIAGONAL_SEARCHES:
+            raise ValueError(f"search algorithm '{algorithm}' cannot move diagonally, "
+                             f"expected one of {DIAGONAL_SEARCHES}")
+        if instruments is not None and algorithm not in INSTRUMENTED_SEARCHES:
+            raise ValueError(f"search algorithm '{algorithm}' cannot be instrumented, "
+                             f"expected one of {INSTRUMENTED_SEARCHES}")
+        if self._separated(self._start_index, self._goal_index):
+            return SearchResult(array('i'), 0, bytearray(len(self._contents)))
+        if instruments is not None:
+            return self._instrumented_search(algorithm, instruments, stop)
+        if algorithm == "weighted_a_star":
+            return self._weighted_a_star(epsilon, stop)
+        return getattr(self, "_" + algorithm)(stop = stop)
 
     def dfs(self) -> tuple[Node, int]:
-        search_count = 0
-        stack = Stack()
-        invalid_cells = [self._start]
-        stack.push(Node(self._start, None, None, None))
-        while not stack.is_empty():
-            node = stack.pop()
-            valid_list = self.get_search_locations(node.cell)
-
-            for valid_cell in valid_list:
-                if valid_cell not in invalid_cells:
-                    search_count += 1
-                    stack.push(Node(valid_cell, node, None, None))
-                    invalid_cells.append(valid_cell)
-                    if valid_cell == self._goal:
-                        return Node(self._goal, node, None, None), search_count
+        return self._found(self.search("dfs"))
 
     def bfs(self) -> tuple[Node, int]:
-        search_count = 0
-        queue = Queue()
-        invalid_cells = [self._start]
-        queue.push(Node(self._start, None, None, None))
-        while not queue.is_empty():
-            node = queue.pop()
-            valid_list = self.get_search_locations(node.cell)
+        return self._found(self.search("bfs"))
 
-            for valid_cell in valid_list:
-                if valid_cell not in invalid_cells:
-                    search_count += 1
-                    queue.push(Node(valid_cell, node, None, None))
+    def a_star(self) -> tuple[Node, int]:
+        ''' A* by path length; the cost of each Node is its distance from the
+            start in steps (sqrt(2) for a diagonal one), whatever cell costs
+            are set, as those are what a_star minimises '''
+        return self._found(self.search("a_star"), costs = True)
 
-                    invalid_cells.append(valid_cell)
-                    if valid_cell == self._goal:
-                        return Node(self._goal, node, None, None), search_count
+    def bidirectional_bfs(self) -> tuple[Node, int]:
+        return self._found(self.search("bidirectional_bfs"))
 
-    def a_star(self) -> tuple[Node, int]:
-        search_count = 0
-        to_explore = PriorityQueue()
-        explored = dict()
+    def bidirectional_a_star(self) -> tuple[Node, int]:
+        return self._found(self.search("bidirectional_a_star"), costs = True)
 
-        n = self._start
-        g_n = 0.0
-        h_n = manhattan(self._start, self._goal)
+    def jps(self) -> tuple[Node, int]:
+        return self._found(self.search("jps"), costs = True)
 
-        f_n = g_n - h_n
+    def dijkstra(self) -> tuple[Node, int]:
+        return self._found(self.search("dijkstra"), costs = True, weighted = True)
 
-        to_explore.insert(f_n, Node(n, None, g_n, h_n))
-        explored[n._position] = g_n  # Cell not hashable, Position is hashable
+    def weighted_a_star(self, epsilon: float = 2.0) -> tuple[Node, int]:
+        return self._found(self.search("weighted_a_star", epsilon = epsilon), costs = True, weighted = True)
 
-        while to_explore.is_empty() == False:
-            e = to_explore.remove_min()
-            n = e._value
+    def _dfs(self, stop: Optional[Callable[[], None]] = None) -> SearchResult:
+        search_count, peak, expanded = 0, 1, 0
+        cols, goal = self._num_cols, self._goal_index
+        offsets, row_edges, col_edges = self._offsets, self._row_edges, self._col_edges
+        diagonal, open_diagonals = self._connectivity == 8, self._open_diagonals
 
-            if n.cell == self._goal: return n, search_count
+        # visited and parent state is kept per buffer index, so every check is O(1)
+        visited = self._contents.translate(BLOCKED_MASK)
+        parents = array('i', [-1]) * len(visited)
+        visited[self._start_index] = 1
 
-            for m in self.get_search_locations(n.cell):
-                g_m = g_n + 1
-                if m._position not in explored.keys() or g_m < explored[m._position]:
+        from Stack import Stack
+        stack = Stack()
+        stack.push(self._start_index)
+        while not stack.is_empty():
+            index = stack.pop()
+            if stop is not None:
+                expanded += 1
+                if expanded % CHECK_EVERY == 0: stop()
+            row, col = divmod(index, cols)
+            edges = row_edges[row] | col_edges[col]
+
+            for offset in offsets[edges] + open_diagonals(index, edges) if diagonal else offsets[edges]:
+                next_index = index + offset
+                if not visited[next_index]:
                     search_count += 1
-                    explored[m._position] = g_m
-                    h_m = manhattan(m, self._goal)
-                    f_m = g_m + h_m
-                    to_explore.insert(f_m, Node(m, n, g_m, h_m))
+                    visited[next_index] = 1
+                    parents[next_index] = index
+                    if next_index == goal:
+                        return SearchResult(self._trace(parents, goal), search_count, visited.translate(VISITED_MASK), peak)
+                    stack.push(next_index)
+            if len(stack) > peak: peak = len(stack)
+
+        return SearchResult(array('i'), search_count, visited.translate(VISITED_MASK), peak)
+
+    def _bfs(self, stop: Optional[Callable[[], None]] = None) -> SearchResult:
+        return self._multi_bfs([self._start_index], [self._goal_index], stop)
+
+    def _a_star(self, start: Optional[int] = None, goal: Optional[int] = None,
+                stop: Optional[Callable[[], None]] = None) -> SearchResult:
+        ''' A* from start to goal (buffer indices, the maze's own by default);
+            the heuristic is the manhattan distance, or the octile distance in
+            an 8-connected maze, and once build_landmarks has run, the larger
+            of that and the landmark bound '''
+        start = self._start_index if start is None else start
+        goal = self._goal_index if goal is None else goal
+        # (distance from landmark to goal, distances from landmark) for every
+        #   landmark in the goal's component
+        landmarks = [(table[goal], table) for table in self._landmarks if table[goal] >= 0]
+        return self._best_first([start], [goal], landmarks = landmarks, stop = stop)
+
+    def _dijkstra(self, stop: Optional[Callable[[], None]] = None) -> SearchResult:
+        ''' cheapest path by the step costs, with no heuristic '''
+        return self._weighted_a_star(0.0, stop)
+
+    def _weighted_a_star(self, epsilon: float, stop: Optional[Callable[[], None]] = None) -> SearchResult:
+        ''' cheapest path by the step costs, using A* with its heuristic scaled
+            by epsilon; the heuristic is the manhattan distance times the
+            smallest cost (the octile distance in an 8-connected maze, where a
+            diagonal step costs sqrt(2) times the cell's cost), which never
+            overestimates, so epsilon = 1 finds a
+            cheapest path and larger values expand fewer cells for a path that
+            costs at most epsilon times as much; epsilon = 0 is Dijkstra's
+            algorithm
+        Raises:
+            ValueError if epsilon is neither 0 nor at least 1
+        '''
+        if epsilon != 0 and epsilon < 1:
+            raise ValueError(f"epsilon must be 0 or at least 1, got {epsilon}")
+        # closing cells keeps the epsilon bound with the inflated heuristic
+        #   and stops cells being expanded more than once
+        costs = self._costs
+        if costs is None:
+            costs = array('f', [1.0]) * len(self._contents)
+        return self._best_first([self._start_index], [self._goal_index], epsilon * self._min_cost, costs, close = True,
+                                stop = stop)
+
+    def _search_state(self, sources: List[int], goals: List[int]) -> Tuple[bytearray, bytearray, array]:
+        ''' returns the goal mask, visited mask and parents array a search
+            from sources to goals starts with: the goals marked 1 in the goal
+            mask, and the sources 1 and blocked cells 2 in the visited mask '''
+        is_goal = bytearray(len(self._contents))
+        for goal in goals:
+            is_goal[goal] = 1
+        visited = self._contents.translate(BLOCKED_MASK)
+        for source in sources:
+            visited[source] = 1
+        return is_goal, visited, array('i', [-1]) * len(visited)
+
+    def _best_first(self, sources: List[int], goals: List[int], scale: float = 1.0, costs: Optional[array] = None,
+                    close: bool = False, landmarks: Optional[List[Tuple[int, array]]] = None,
+                    stop: Optional[Callable[[], None]] = None) -> SearchResult:
+        ''' the A* loop behind a_star, dijkstra, weighted_a_star and the
+            multi-source, multi-goal a_star: searches from every source at
+            once and stops at the first goal expanded
+        Args:
+            sources:    buffer indices to start from, all open
+            goals:      buffer indices to reach, all open
+            scale:      factor for the heuristic, the distance to the nearest
+                        goal (manhattan, or octile in an 8-connected maze):
+                        1 for A*, 0 for Dijkstra's algorithm
+            costs:      cost of stepping onto each cell, which multiplies the
+                        length of the step; None for 1 everywhere
+            close:      never reopen a cell once it is expanded
+            landmarks:  (distance from landmark to goal, distances from
+                        landmark) pairs for a single goal; the heuristic is
+                        at least each landmark bound
+            stop:       called once every CHECK_EVERY expansions, as for search
+        '''
+        search_count, peak, expanded = 0, len(sources), 0
+        cols = self._num_cols
+        offsets, row_edges, col_edges = self._offsets, self._row_edges, self._col_edges
+        diagonal, open_diagonals = self._connectivity == 8, self._open_diagonals
+        goal_cells = [divmod(goal, cols) for goal in goals]
+        goal_row, goal_col = goal_cells[0]
+        # the common case of one goal and no landmarks is worked out in the
+        #   loop below, saving a call per cell generated
+        landmarks = landmarks or []
+        general = len(goals) > 1 or len(landmarks) > 0
+
+        def heuristic(index: int) -> float:
+            row, col = divmod(index, cols)
+            best = inf
+            for target_row, target_col in goal_cells:
+                row_dist, col_dist = abs(target_row - row), abs(target_col - col)
+                h = row_dist + col_dist
+                if diagonal:
+                    h += (SQRT2 - 2) * min(row_dist, col_dist)
+                if h < best:
+                    best = h
+            best *= scale
+            for to_goal, table in landmarks:
+                if abs(to_goal - table[index]) > best:
+                    best = abs(to_goal - table[index])
+            return best
+
+        # the indexed heap holds at most one entry per open cell, keyed by
+        #   (f, h) so that ties on f go to the cell nearer the goal; a cell is
+        #   marked 1 once reached and, with close, 3 once expanded
+        from PriorityQueue import IndexedPriorityQueue
+        to_explore = IndexedPriorityQueue()
+        is_goal, visited, parents = self._search_state(sources, goals)
+        g_scores = array('d', [inf]) * len(visited)
+        for source in sources:
+            g_scores[source] = 0.0
+            h = heuristic(source)
+            to_explore.insert((h, h), source, source)
 
-    def show_path(self, node: Node) -> None:
-        path = []
-        while node.parent is not None:
-            path.append(node.cell)
-            node = node.parent
-        path.append(node.cell)
+        while to_explore.is_empty() == False:
+            if len(to_explore) > peak: peak = len(to_explore)
+            n = to_explore.remove_min()._value
+            if is_goal[n]:
+                return SearchResult(self._trace(parents, n), search_count, visited.translate(CLOSED_MASK), peak)
+            if close:
+                visited[n] = 3
+            if stop is not None:
+                expanded += 1
+                if expanded % CHECK_EVERY == 0: stop()
+
+            g_n = g_scores[n]
+            row, col = divmod(n, cols)
+            edges = row_edges[row] | col_edges[col]
+            # straight steps have length 1 and diagonal ones sqrt(2)
+            for moves, step in (((offsets[edges], 1.0), (open_diagonals(n, edges), SQRT2)) if diagonal
+                                else ((offsets[edges], 1.0),)):
+                for offset in moves:
+                    m = n + offset
+                    g_m = g_n + step if costs is None else g_n + step * costs[m]
+                    if g_m < g_scores[m] and visited[m] < 2:
+                        search_count += 1
+                        visited[m] = 1
+                        g_scores[m] = g_m
+                        parents[m] = n
+                        if general:
+                            h_m = heuristic(m)
+                        elif scale:
+                            m_row, m_col = divmod(m, cols)
+                            row_dist, col_dist = abs(goal_row - m_row), abs(goal_col - m_col)
+                            h_m = row_dist + col_dist
+                            if diagonal:
+                                h_m += (SQRT2 - 2) * min(row_dist, col_dist)
+                            h_m *= scale
+                        else:
+                            h_m = 0.0
+                        to_explore.update_or_insert(m, (g_m + h_m, h_m), m)
+
+        return SearchResult(array('i'), search_count, visited.translate(CLOSED_MASK), peak)
+
+    def _multi_bfs(self, sources: List[int], goals: List[int],
+                   stop: Optional[Callable[[], None]] = None) -> SearchResult:
+        ''' bfs from every source at once, stopping at the first goal
+            generated; bfs is the case of one source and one goal '''
+        search_count, peak, expanded = 0, len(sources), 0
+        cols = self._num_cols
+        offsets, row_edges, col_edges = self._offsets, self._row_edges, self._col_edges
+        diagonal, open_diagonals = self._connectivity == 8, self._open_diagonals
+
+        is_goal, visited, parents = self._search_state(sources, goals)
+        for source in sources:
+            if is_goal[source]:
+                return SearchResult(array('i', [source]), 0, visited.translate(VISITED_MASK), peak)
+
+        # expand one whole level of the search at a time; the queue only
+        #   ever holds the frontier of the current level
+        from Queue import Queue
+        queue = Queue()
+        queue.push_many(sources)
+        while not queue.is_empty():
+            frontier = []
+            for index in queue.pop_many():
+                if stop is not None:
+                    expanded += 1
+                    if expanded % CHECK_EVERY == 0: stop()
+                row, col = divmod(index, cols)
+                edges = row_edges[row] | col_edges[col]
+
+                for offset in offsets[edges] + open_diagonals(index, edges) if diagonal else offsets[edges]:
+                    next_index = index + offset
+                    if not visited[next_index]:
+                        search_count += 1
+                        visited[next_index] = 1
+                        parents[next_index] = index
+                        if is_goal[next_index]:
+                            return SearchResult(self._trace(parents, next_index), search_count,
+                                                visited.translate(VISITED_MASK), peak)
+                        frontier.append(next_index)
+            queue.push_many(frontier)
+            if len(frontier) > peak: peak = len(frontier)
+
+        return SearchResult(array('i'), search_count, visited.translate(VISITED_MASK), peak)
+
+    def _multi_a_star(self, sources: List[int], goals: List[int]) -> SearchResult:
+        ''' A* from every source at once, stopping at the first goal expanded;
+            the heuristic is the distance to the nearest goal, manhattan or
+            octile by the connectivity, so it stays admissible '''
+        return self._best_first(sources, goals)
+
+    def _instrumented_search(self, algorithm: str, instruments: 'Instruments',
+                             stop: Optional[Callable[[], None]] = None) -> SearchResult:
+        ''' dfs, bfs or a_star, expanding cells in the same order and returning
+            the same result as the plain searches, but calling the hooks of
+            instruments at every event and timing each phase; kept apart from
+            the plain searches so that they pay nothing for it '''
+        clock = time.perf_counter
+        search_start = clock()
+        timers = instruments.timers
+        on_expand, on_push, on_pop, on_goal = \
+            instruments.on_expand, instruments.on_push, instruments.on_pop, instruments.on_goal
 
-        path.reverse()
+        search_count = 0
+        contents, cols = self._contents, self._num_cols
+        start, goal = self._start_index, self._goal_index
+        goal_row, goal_col = divmod(goal, cols)
+        landmarks = [(table[goal], table) for table in self._landmarks if table[goal] >= 0]
+        diagonal = self._connectivity == 8
+
+        visited = contents.translate(BLOCKED_MASK)
+        parents = array('i', [-1]) * len(visited)
+        g_scores = array('d', [inf]) * len(visited)
+        closed = bytearray(len(visited))
+
+        if algorithm == "a_star":
+            from PriorityQueue import IndexedPriorityQueue
+            frontier = IndexedPriorityQueue()
+        elif algorithm == "dfs":
+            from Stack import Stack
+            frontier = Stack()
+        else:
+            from Queue import Queue
+            frontier = Queue()
+
+        def push(index: int) -> None:
+            if algorithm == "a_star":
+                t = clock()
+                row, col = divmod(index, cols)
+                row_dist, col_dist = abs(goal_row - row), abs(goal_col - col)
+                h = row_dist + col_dist
+                if diagonal:
+                    h += (SQRT2 - 2) * min(row_dist, col_dist)
+                for to_goal, table in landmarks:
+                    h = max(h, abs(to_goal - table[index]))
+                timers["heuristic"] += clock() - t
+                instruments.heuristic_calls += 1
+
+                t = clock()
+                frontier.update_or_insert(index, (g_scores[index] + h, h), index)
+            else:
+                t = clock()
+                frontier.push(index)
+            timers["frontier"] += clock() - t
+            instruments.pushed += 1
+            if len(frontier) > instruments.frontier_peak:
+                instruments.frontier_peak = len(frontier)
+            if on_push is not None:
+                on_push(index)
+
+        def finish(found: bool) -> SearchResult:
+            if found and on_goal is not None:
+                on_goal(goal)
+            timers["total"] += clock() - search_start
+            path = self._trace(parents, goal) if found else array('i')
+            return SearchResult(path, search_count, visited.translate(VISITED_MASK), instruments.frontier_peak)
+
+        visited[start] = 1
+        g_scores[start] = 0.0
+        push(start)
+        while not frontier.is_empty():
+            t = clock()
+            n = frontier.remove_min()._value if algorithm == "a_star" else frontier.pop()
+            timers["frontier"] += clock() - t
+            instruments.popped += 1
+            if on_pop is not None:
+                on_pop(n)
+            if algorithm == "a_star":
+                if n == goal:
+                    return finish(True)
+                closed[n] = 1
+
+            instruments.expanded += 1
+            if on_expand is not None:
+                on_expand(n)
+            if stop is not None and instruments.expanded % CHECK_EVERY == 0: stop()
+            t = clock()
+            neighbors = self._neighbor_indices(n)
+            timers["neighbors"] += clock() - t
+
+            for m in neighbors:
+                if algorithm != "a_star":
+                    if not visited[m]:
+                        search_count += 1
+                        visited[m] = 1
+                        parents[m] = n
+                        if m == goal:
+                            return finish(True)
+                        push(m)
+                elif g_scores[n] + self._step_cost(n, m) < g_scores[m] and visited[m] != 2:
+                    if closed[m]:
+                        instruments.reopened += 1
+                        closed[m] = 0
+                    search_count += 1
+                    visited[m] = 1
+                    g_scores[m] = g_scores[n] + self._step_cost(n, m)
+                    parents[m] = n
+                    push(m)
+
+        return finish(False)
+
+    def _join(self, parents: tuple[array, array], forward: int, backward: int) -> array:
+        ''' joins the forward search's path from the start to forward with the
+            backward search's path from backward to the goal; forward and
+            backward are the same cell or neighbours '''
+        path = self._trace(parents[0], forward)
+        if backward == forward:
+            backward = parents[1][backward]
+        while backward != -1:
+            path.append(backward)
+            backward = parents[1][backward]
+        return path
+
+    def _bidirectional_bfs(self, stop: Optional[Callable[[], None]] = None) -> SearchResult:
+        search_count, peak, expanded = 0, 2, 0
+        cols = self._num_cols
+        offsets, row_edges, col_edges = self._offsets, self._row_edges, self._col_edges
+
+        seen = self._contents.translate(BLOCKED_MASK)
+        parents = (array('i', [-1]) * len(seen), array('i', [-1]) * len(seen))
+        seen[self._start_index] |= FORWARD
+        seen[self._goal_index] |= BACKWARD
+
+        # grow whichever frontier is smaller by one whole level; the first
+        #   cell found that the other side has reached joins two paths whose
+        #   lengths add up to the shortest possible one
+        frontiers = [[self._start_index], [self._goal_index]]
+        while frontiers[0] and frontiers[1]:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            mine, other = (FORWARD, BACKWARD) if side == 0 else (BACKWARD, FORWARD)
+            parent = parents[side]
+
+            frontier = []
+            for index in frontiers[side]:
+                if stop is not None:
+                    expanded += 1
+                    if expanded % CHECK_EVERY == 0: stop()
+                row, col = divmod(index, cols)
+
+                for offset in offsets[row_edges[row] | col_edges[col]]:
+                    next_index = index + offset
+                    state = seen[next_index]
+                    if state & other:
+                        path = self._join(parents, index, next_index) if side == 0 else \
+                               self._join(parents, next_index, index)
+                        return SearchResult(path, search_count, seen.translate(BIDIRECTIONAL_MASK), peak)
+                    if state == 0:
+                        search_count += 1
+                        seen[next_index] = mine
+                        parent[next_index] = index
+                        frontier.append(next_index)
+            frontiers[side] = frontier
+            if len(frontiers[0]) + len(frontiers[1]) > peak: peak = len(frontiers[0]) + len(frontiers[1])
+
+        return SearchResult(array('i'), search_count, seen.translate(BIDIRECTIONAL_MASK), peak)
+
+    def _bidirectional_a_star(self, stop: Optional[Callable[[], None]] = None) -> SearchResult:
+        search_count, peak, expanded = 0, 2, 0
+        cols = self._num_cols
+        offsets, row_edges, col_edges = self._offsets, self._row_edges, self._col_edges
+        start, goal = self._start_index, self._goal_index
+        start_row, start_col = divmod(start, cols)
+        goal_row, goal_col = divmod(goal, cols)
+
+        # side 0 searches forward from the start, side 1 backward from the goal;
+        #   both use the average of the manhattan distances to the goal and
+        #   to the start, p_0(v) = (h_goal(v) - h_start(v)) / 2 + d / 2 and
+        #   p_1(v) = d - p_0(v), which stay consistent for both sides and
+        #   make the two searches meet in the middle
+        d = manhattan(self._start, self._goal)
+        flags = (FORWARD, BACKWARD)
+        seen = self._contents.translate(BLOCKED_MASK)
+        g_scores = (array('d', [inf]) * len(seen), array('d', [inf]) * len(seen))
+        parents = (array('i', [-1]) * len(seen), array('i', [-1]) * len(seen))
+        from PriorityQueue import IndexedPriorityQueue
+        to_explore = (IndexedPriorityQueue(), IndexedPriorityQueue())
+
+        for side, n in ((0, start), (1, goal)):
+            g_scores[side][n] = 0.0
+            seen[n] |= flags[side]
+            to_explore[side].insert((d if side == 0 else 0.0, 0.0), n, n)
+        # the backward search's key at the goal starts at 0 rather than
+        #   p_1(goal) = d, so every key on side 1 is shifted down by d
+
+        best, meet = inf, -1  # cost of the shortest path found so far, and where the sides met on it
+        while not to_explore[0].is_empty() and not to_explore[1].is_empty():
+            # a path not yet found must leave both open lists, so it costs at
+            #   least the sum of their smallest keys
+            keys = (to_explore[0].min()._key, to_explore[1].min()._key)
+            if keys[0][0] + keys[1][0] >= best:
+                break
+
+            side = 0 if keys[0] <= keys[1] else 1
+            if len(to_explore[0]) + len(to_explore[1]) > peak: peak = len(to_explore[0]) + len(to_explore[1])
+            g, other_g, parent = g_scores[side], g_scores[1 - side], parents[side]
+            sign = 1 if side == 0 else -1
+
+            n = to_explore[side].remove_min()._value
+            if stop is not None:
+                expanded += 1
+                if expanded % CHECK_EVERY == 0: stop()
+            g_m = g[n] + 1
+            row, col = divmod(n, cols)
+            for offset in offsets[row_edges[row] | col_edges[col]]:
+                m = n + offset
+                if g_m < g[m] and seen[m] != 2:
+                    search_count += 1
+                    seen[m] |= flags[side]
+                    g[m] = g_m
+                    parent[m] = n
+                    m_row, m_col = divmod(m, cols)
+                    h_goal = abs(goal_row - m_row) + abs(goal_col - m_col)
+                    h_start = abs(start_row - m_row) + abs(start_col - m_col)
+                    p_m = sign * (h_goal - h_start) / 2 + d / 2 - (0 if side == 0 else d)
+                    to_explore[side].update_or_insert(m, (g_m + p_m, -g_m), m)
+                    if g_m + other_g[m] < best:
+                        best, meet = g_m + other_g[m], m
+
+        if meet == -1:
+            return SearchResult(array('i'), search_count, seen.translate(BIDIRECTIONAL_MASK), peak)
+        return SearchResult(self._join(parents, meet, meet), search_count, seen.translate(BIDIRECTIONAL_MASK), peak)
+
+    def _jump_stops(self) -> Tuple[bytes, bytes]:
+        ''' returns where a horizontal move east and one west must stop, one
+            byte per cell: bit 2 set for a blocked cell, bit 1 for a jump
+            point, i.e., the goal or a cell with a forced neighbour (an open
+            cell above or below it whose own neighbour back along the move is
+            blocked), and 0 otherwise; the west bytes are in reverse order, so
+            that both can be searched forwards
+
+            Each byte is one cell of a big int, and the neighbours of all the
+            cells are lined up with shifts by whole rows, so the marks for the
+            whole grid take a handful of big int operations. A move stays
+            inside its row, so no mark read from a row above or below wraps
+            round to the wrong column.
+        '''
+        size, cols = len(self._contents), self._num_cols
+        full = (1 << 8 * size) - 1
+        blocked = int.from_bytes(self._contents.translate(BLOCKED_MASK), "little") >> 1
+        open_ = int.from_bytes(b"\x01" * size, "little") ^ blocked
+        above, below = open_ << 8 * cols, open_ >> 8 * cols
+        east = (above & blocked << 8 * (cols + 1) | below & blocked >> 8 * (cols - 1)) & full | blocked << 1
+        west = (above & blocked << 8 * (cols - 1) | below & blocked >> 8 * (cols + 1)) & full | blocked << 1
+
+        east, west = bytearray(east.to_bytes(size, "little")), bytearray(west.to_bytes(size, "little"))
+        east[self._goal_index] = west[self._goal_index] = 1
+        return bytes(east), bytes(west[::-1])
+
+    def _jump_horizontal(self, index: int, step: int, stops: Tuple[Callable, bytes, bytes]) -> int:
+        ''' moves from index along its row by step (1 or -1) and returns the
+            first jump point found, or -1 if the move runs into a block or the
+            edge of the grid
+        Args:
+            stops: a compiled search for a nonzero byte and the east and west
+                   bytes of _jump_stops, so the move is one search in C
+        '''
+        find, east, west = stops
+        row_start = index - index % self._num_cols
+        if step == 1:
+            match = find(east, index + 1, row_start + self._num_cols)
+            if match is None or east[match.start()] & 2:
+                return -1
+            return match.start()
+        size = len(west)
+        match = find(west, size - index, size - row_start)
+        if match is None or west[match.start()] & 2:
+            return -1
+        return size - 1 - match.start()
+
+    def _jump_vertical(self, index: int, step: int, stops: Tuple[Callable, bytes, bytes]) -> int:
+        ''' moves from index along its column by step (cols or -cols) and returns
+            the first jump point found, or -1; a cell on the way is a jump point
+            if it is the goal or a horizontal move from it finds a jump point '''
+        contents, goal = self._contents, self._goal_index
+
+        while True:
+            index += step
+            if index < 0 or index >= len(contents) or contents[index] == BLOCKED:
+                return -1
+            if index == goal or self._jump_horizontal(index, 1, stops) != -1 \
+                    or self._jump_horizontal(index, -1, stops) != -1:
+                return index
+
+    def _jps(self, stop: Optional[Callable[[], None]] = None) -> SearchResult:
+        ''' jump point search for 4-connected grids: A* over jump points only,
+            using the canonical order in which a path may turn from vertical to
+            horizontal anywhere, but from horizontal to vertical only where a
+            block forces it; the path found is as short as a_star's '''
+        search_count, peak, expanded = 0, 1, 0
+        contents, cols, goal = self._contents, self._num_cols, self._goal_index
+        goal_row, goal_col = divmod(goal, cols)
+
+        from PriorityQueue import IndexedPriorityQueue
+        to_explore = IndexedPriorityQueue()
+        visited = contents.translate(BLOCKED_MASK)
+        g_scores = array('d', [inf]) * len(visited)
+        parents = array('i', [-1]) * len(visited)
+        import re
+        stops = (re.compile(b"[^\x00]").search,) + self._jump_stops()
+
+        n = self._start_index
+        g_scores[n] = 0.0
+        visited[n] = 1
+        h_n = manhattan(self._start, self._goal)
+        to_explore.insert((h_n, h_n), n, n)
 
-        for cell in path:
-            if cell != self._start and cell != self._goal:
-                cell.mark_on_path()
-        print(self)
+        while to_explore.is_empty() == False:
+            if len(to_explore) > peak: peak = len(to_explore)
+            n = to_explore.remove_min()._value
+            if n == goal:
+                break
+            if stop is not None:
+                expanded += 1
+                if expanded % CHECK_EVERY == 0: stop()
+
+            # pick the directions to jump in from the way n was reached
+            parent = parents[n]
+            if parent == -1:
+                jumps = [self._jump_vertical(n, cols, stops), self._jump_vertical(n, -cols, stops),
+                         self._jump_horizontal(n, 1, stops), self._jump_horizontal(n, -1, stops)]
+            elif n // cols == parent // cols:
+                step = 1 if n > parent else -1
+                jumps = [self._jump_horizontal(n, step, stops)]
+                if n >= cols and contents[n - cols] != BLOCKED and contents[n - cols - step] == BLOCKED:
+                    jumps.append(self._jump_vertical(n, -cols, stops))
+                if n + cols < len(contents) and contents[n + cols] != BLOCKED and contents[n + cols - step] == BLOCKED:
+                    jumps.append(self._jump_vertical(n, cols, stops))
+            else:
+                jumps = [self._jump_vertical(n, cols if n > parent else -cols, stops),
+                         self._jump_horizontal(n, 1, stops), self._jump_horizontal(n, -1, stops)]
+
+            row, col = divmod(n, cols)
+            for m in jumps:
+                if m == -1:
+                    continue
+                m_row, m_col = divmod(m, cols)
+                g_m = g_scores[n] + abs(m_row - row) + abs(m_col - col)
+                if g_m < g_scores[m]:
+                    search_count += 1
+                    visited[m] = 1
+                    g_scores[m] = g_m
+                    parents[m] = n
+                    h_m = abs(goal_row - m_row) + abs(goal_col - m_col)
+                    to_explore.update_or_insert(m, (g_m + h_m, h_m), m)
+
+        if g_scores[goal] == inf:
+            return SearchResult(array('i'), search_count, visited.translate(VISITED_MASK), peak)
+
+        # fill in the straight runs of cells between consecutive jump points
+        jump_points = self._trace(parents, goal)
+        path = array('i', jump_points[:1])
+        for a, b in zip(jump_points, jump_points[1:]):
+            step = (1 if b > a else -1) if a // cols == b // cols else (cols if b > a else -cols)
+            path.extend(range(a + step, b + step, step))
+        return SearchResult(path, search_count, visited.translate(VISITED_MASK), peak)
+
+    def show_path(self, found: 'Node|SearchResult', margin: Optional[int] = None) -> None:
+        ''' prints the maze with a path drawn over it, a row at a time; the
+            maze itself is not modified
+        Args:
+            found:   the goal Node returned by a search, or a SearchResult
+            margin:  if given, print only the part of the maze around the
+                     path, this many cells beyond it on each side
+        '''
+        if isinstance(found, SearchResult):
+            path = found.path
+        else:
+            path = []
+            node = found
+            while node is not None:
+                path.append(self._index(node.cell._position))
+                node = node.parent
+        viewport = None if margin is None else self.viewport(path, margin)
+        self.write(sys.stdout, path, viewport)
 
     def path_length(self, node: Node) -> int:
         path = []
@@ -319,46 +1606,70 @@ def make_10x10_maze() -> Maze:
     # add the blocks at the appropriate spots
     blocks = [(0, 5), (0, 7), (1, 1), (2, 7), (3, 1), (3, 2), (3, 9), (4, 2), (5, 2), (5, 5), (6, 1), (8, 5), (8, 9)]
     for r, c in blocks:
-        maze._grid[r][c]._contents = Contents.BLOCKED
+        maze.set_contents(Position(r, c), Contents.BLOCKED)
 
     return maze
 
 
-def one_experiment(maze_orig: Maze, show: bool = False):
-    maze = maze_orig
-    mazebfs = copy.deepcopy(maze)
-    mazedfs = copy.deepcopy(maze)
-
-    dfs = mazedfs.dfs()
-
-    while dfs is not None:
-        dfs_goal = dfs[0]
-        dfs_count = dfs[1]
-        dfs_length = mazedfs.path_length(dfs_goal)
-
-        bfs = mazebfs.bfs()
-        bfs_goal = bfs[0]
-        bfs_count = bfs[1]
-        bfs_length = mazebfs.path_length(bfs_goal)
+def one_experiment(maze: Maze, show: bool = False):
+    # every search leaves the maze untouched, so all three share it
+    dfs = maze.search("dfs")
 
-        a_star = maze.a_star()
-        a_star_goal = a_star[0]
-        a_star_count = a_star[1]
-        a_star_length = maze.path_length(a_star_goal)
+    if dfs.found():
+        bfs = maze.search("bfs")
+        a_star = maze.search("a_star")
 
-        search_size = [dfs_count, bfs_count, a_star_count]
-        path_length = [dfs_length, bfs_length, a_star_length]
+        search_size = [dfs.count, bfs.count, a_star.count]
+        path_length = [len(dfs.path), len(bfs.path), len(a_star.path)]
 
         if show == True:
-            mazedfs.show_path(dfs_goal)
-            mazebfs.show_path(bfs_goal)
-            maze.show_path(a_star_goal)
+            maze.show_path(dfs)
+            maze.show_path(bfs)
+            maze.show_path(a_star)
 
-        return [search_size, path_length, a_star_length == bfs_length, mazedfs.is_path_same(maze, bfs_goal, a_star_goal)]
+        return [search_size, path_length, path_length[2] == path_length[1], bfs.path == a_star.path]
     else:
         return "This maze is not solvable"
 
 
+class MazeSpec(namedtuple("MazeSpec", "rows cols prop_blocked seed")):
+    ''' everything needed to rebuild the same random maze in another process
+        (rows: int, cols: int, prop_blocked: float, seed: int); the start is
+        the top-left cell and the goal the bottom-right one '''
+    __slots__ = ()
+
+
+def _spec_experiment(spec: MazeSpec):
+    ''' builds the maze described by spec and runs one_experiment on it;
+        a top-level function so that worker processes can unpickle it '''
+    maze = Maze(spec.rows, spec.cols, spec.prop_blocked, Position(0, 0), Position(spec.rows - 1, spec.cols - 1),
+                seed = spec.seed)
+    return spec, one_experiment(maze)
+
+
+def run_experiments(specs: Iterable[MazeSpec], workers: Optional[int] = None,
+                    chunksize: int = 16) -> Iterator[Tuple[MazeSpec, list]]:
+    ''' runs one_experiment on the maze described by every spec, spread over
+        a pool of worker processes; each worker builds its own mazes from the
+        specs, so no grids are pickled between processes
+    Args:
+        specs:      the mazes to solve
+        workers:    number of worker processes; os.cpu_count() if None, and
+                    1 runs every experiment in this process
+        chunksize:  number of specs handed to a worker at a time
+    Returns:
+        an iterator of (spec, one_experiment result) pairs, in the order the
+        experiments complete rather than the order of specs
+    '''
+    if workers == 1:
+        yield from map(_spec_experiment, specs)
+        return
+
+    import multiprocessing
+    with multiprocessing.Pool(workers) as pool:
+        yield from pool.imap_unordered(_spec_experiment, specs, chunksize)
+
+
 def main():
     '''
     maze = make_10x10_maze()
@@ -405,6 +1716,7 @@ def main():
         print("No solution using A*")
     print()
     '''
+    import random
     for i in range(30):
         rows = random.randint(5,30)
         cols = random.randint(5,30)
@@ -412,4 +1724,7 @@ def main():
         print(one_experiment(maze, show = False))
 
 
-main()
+# worker processes started by run_experiments may import this module, so
+# the demo must only run when the file is executed directly
+if __name__ == "__main__":
+    main()
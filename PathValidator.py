@@ -0,0 +1,115 @@
+from array import array
+from itertools import repeat
+from math import isclose
+from operator import add, and_, floordiv, mul, or_, sub
+from typing import Iterable, List, NamedTuple
+
+from Maze import BLOCKED, SQRT2, Maze
+
+# translation table from contents codes to 1 for blocked cells, 0 otherwise
+BLOCKED_BITS = bytes(1 if code == BLOCKED else 0 for code in range(256))
+
+
+class PathCheck(NamedTuple):
+    ''' the outcome of checking one path; an empty path passes every check
+        when, and only when, the goal cannot be reached
+            contiguous: every step moves to a neighbouring cell the maze's
+                        connectivity and corner rule allow
+            unblocked:  no cell on the path is blocked
+            endpoints:  the path runs from the start to the goal
+            shortest:   the path is contiguous and as cheap as it can be:
+                        it has as few steps as a breadth first search in a
+                        4-connected maze with no costs, and otherwise costs
+                        what the cheapest dijkstra path does, by
+                        Maze.path_cost '''
+    contiguous: bool
+    unblocked: bool
+    endpoints: bool
+    shortest: bool
+
+    def ok(self) -> bool:
+        return all(self)
+
+
+class PathValidator:
+    ''' checks solver output against one maze: a path is taken as an array of
+        buffer indices, such as SearchResult.path, and each check is one pass
+        of map, zip, set, bytes or translate over the whole path, so that the
+        loops run in C rather than step by step in Python '''
+
+    def __init__(self, maze: Maze):
+        '''
+        Args:
+            maze: the maze the paths were found in; its contents, costs and
+                  the shortest distance or cheapest cost from its start to
+                  its goal are read once here, so make a new validator after
+                  changing the maze
+        '''
+        self._contents = bytes(maze._contents)
+        self._cols = cols = maze._num_cols
+        self._start = maze._start_index
+        self._goal = maze._goal_index
+        self._corner_cutting = maze._corner_cutting
+
+        # the (buffer index, row) changes of the steps a path may take; the
+        #   row change tells a step east or west from one that wraps a row
+        self._steps = {(cols, 1), (-cols, -1), (1, 0), (-1, 0)}
+        if maze._connectivity == 8:
+            self._steps |= {(cols + 1, 1), (cols - 1, 1), (1 - cols, -1), (-1 - cols, -1)}
+        self._diagonal = maze._connectivity == 8
+
+        # a diagonal step or a cell cost makes fewest steps and cheapest
+        #   differ, so those mazes compare costs with dijkstra's path instead
+        self._costs = None if maze._costs is None else array('f', maze._costs)
+        self._by_cost = self._diagonal or self._costs is not None
+        if self._by_cost:
+            cheapest = maze.search("dijkstra")
+            self._reachable = cheapest.found()
+            self._goal_cost = maze.path_cost(cheapest.path)
+        else:
+            self._goal_distance = maze._bfs_distances(self._start)[self._goal]
+            self._reachable = self._goal_distance != -1
+
+    def check(self, path: 'array|List[int]') -> PathCheck:
+        ''' checks one path of buffer indices
+        Returns:
+            a PathCheck; a path with an index outside the maze fails every check
+        '''
+        if len(path) == 0:
+            unreachable = not self._reachable
+            return PathCheck(True, True, unreachable, unreachable)
+        if min(path) < 0 or max(path) >= len(self._contents):
+            return PathCheck(False, False, False, False)
+
+        cols = self._cols
+        rows_of = array('i', map(floordiv, path, repeat(cols)))
+        steps = array('i', map(sub, path[1:], path))
+        row_steps = array('i', map(sub, rows_of[1:], rows_of))
+        contiguous = set(zip(steps, row_steps)) <= self._steps
+        diagonal = bytes(len(steps))
+
+        # a diagonal step from a to b passes the cells a + col_step and
+        #   b - col_step, which the corner rule looks at
+        if contiguous and self._diagonal:
+            col_steps = array('i', map(sub, steps, map(mul, row_steps, repeat(cols))))
+            diagonal = bytes(map(abs, map(mul, row_steps, col_steps)))
+            beside_a = bytes(map(self._contents.__getitem__, map(add, path[:-1], col_steps))).translate(BLOCKED_BITS)
+            beside_b = bytes(map(self._contents.__getitem__, map(sub, path[1:], col_steps))).translate(BLOCKED_BITS)
+            corners = map(and_ if self._corner_cutting else or_, beside_a, beside_b)
+            contiguous = 1 not in bytes(map(and_, diagonal, corners))
+
+        unblocked = BLOCKED not in bytes(map(self._contents.__getitem__, path))
+        endpoints = path[0] == self._start and path[-1] == self._goal
+        if not self._by_cost:
+            shortest = contiguous and self._reachable and len(path) - 1 == self._goal_distance
+        else:
+            # the cost of a step is the cost of the cell stepped onto, times
+            #   sqrt(2) for a diagonal step, as Maze.path_cost sums it
+            weights = map((1.0, SQRT2).__getitem__, diagonal)
+            cells = repeat(1.0) if self._costs is None else map(self._costs.__getitem__, path[1:])
+            shortest = contiguous and self._reachable and isclose(sum(map(mul, weights, cells)), self._goal_cost)
+        return PathCheck(contiguous, unblocked, endpoints, shortest)
+
+    def check_many(self, paths: Iterable['array|List[int]']) -> List[PathCheck]:
+        ''' checks every path in paths, returning their PathChecks in order '''
+        return list(map(self.check, paths))
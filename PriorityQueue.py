@@ -1,10 +1,8 @@
 # see https://medium.com/@steveYeah/using-generics-in-python-99010e5056eb
-from typing import Generic, TypeVar
+from typing import Dict, Generic, List, TypeVar
 T = TypeVar("T")  # allows variable T to be used to represent a generic type
 
-from heapq import *
-import random
-import string
+from heapq import heappop, heappush
 
 class Entry(Generic[T]):
     def __init__(self, priority: 'float|str', data: T):
@@ -38,12 +36,129 @@ class PriorityQueue(Generic[T]):
         e = Entry(key, item)
         heappush(self._container, e)
 
+    def min(self) -> Entry:
+        ''' returns the entry with the smallest key without removing it '''
+        return self._container[0]
+
     def remove_min(self) -> Entry:
         return heappop(self._container)
 
 
+class IndexedPriorityQueue(PriorityQueue[T]):
+    ''' a binary heap in which every entry is also keyed by an integer handle
+        (e.g., the buffer index of a maze cell); each handle is in the heap at
+        most once, so a better key for an item moves its existing entry rather
+        than adding a second one, and the heap never grows past the number of
+        distinct handles in it '''
+    __slots__ = ('_handles', '_positions')
+
+    def __init__(self):
+        super().__init__()
+        self._handles: List[int] = list()          # handle of each entry in _container
+        self._positions: Dict[int, int] = dict()   # handle -> position in _container
+
+    def contains(self, handle: int) -> bool:
+        return handle in self._positions
+
+    def __contains__(self, handle: int) -> bool:
+        return handle in self._positions
+
+    def insert(self, key: 'float|str|tuple', item: T, handle: int) -> None:
+        if handle in self._positions:
+            raise KeyError(f"handle {handle} is already in the priority queue")
+        self._container.append(Entry(key, item))
+        self._handles.append(handle)
+        self._sift_up(len(self._container) - 1)
+
+    def remove_min(self) -> Entry:
+        container, handles, positions = self._container, self._handles, self._positions
+        last, last_handle = container.pop(), handles.pop()
+        if len(container) == 0:
+            del positions[last_handle]
+            return last
+
+        top = container[0]
+        del positions[handles[0]]
+        container[0], handles[0] = last, last_handle
+        self._sift_down(0)
+        return top
+
+    def remove(self, handle: int) -> Entry:
+        ''' removes and returns the entry with the given handle '''
+        container, handles, positions = self._container, self._handles, self._positions
+        pos = positions.pop(handle)
+        entry = container[pos]
+        last, last_handle = container.pop(), handles.pop()
+        if pos < len(container):
+            container[pos], handles[pos] = last, last_handle
+            self._sift_up(pos)
+            self._sift_down(positions[last_handle])
+        return entry
+
+    def decrease_key(self, handle: int, key: 'float|str|tuple', item: T = None) -> None:
+        ''' lowers the key of the entry with the given handle, optionally
+            replacing its item as well '''
+        pos = self._positions[handle]
+        entry = self._container[pos]
+        if entry._key < key:
+            raise ValueError(f"decrease_key() given a larger key for handle {handle}")
+        entry._key = key
+        if item is not None:
+            entry._value = item
+        self._sift_up(pos)
+
+    def update_or_insert(self, handle: int, key: 'float|str|tuple', item: T) -> bool:
+        ''' sets the key and item of the entry with the given handle, inserting
+            a new entry if there is none
+        Returns:
+            True if a new entry was inserted, False if an existing one was updated
+        '''
+        pos = self._positions.get(handle)
+        if pos is None:
+            self.insert(key, item, handle)
+            return True
+        entry = self._container[pos]
+        entry._key, entry._value = key, item
+        self._sift_up(pos)
+        self._sift_down(self._positions[handle])
+        return False
+
+    def _sift_up(self, pos: int) -> None:
+        container, handles, positions = self._container, self._handles, self._positions
+        entry, handle = container[pos], handles[pos]
+        while pos > 0:
+            parent = (pos - 1) >> 1
+            if not entry < container[parent]:
+                break
+            container[pos], handles[pos] = container[parent], handles[parent]
+            positions[handles[pos]] = pos
+            pos = parent
+        container[pos], handles[pos] = entry, handle
+        positions[handle] = pos
+
+    def _sift_down(self, pos: int) -> None:
+        container, handles, positions = self._container, self._handles, self._positions
+        size = len(container)
+        entry, handle = container[pos], handles[pos]
+        while True:
+            child = 2 * pos + 1
+            if child >= size:
+                break
+            if child + 1 < size and container[child + 1] < container[child]:
+                child += 1
+            if not container[child] < entry:
+                break
+            container[pos], handles[pos] = container[child], handles[child]
+            positions[handles[pos]] = pos
+            pos = child
+        container[pos], handles[pos] = entry, handle
+        positions[handle] = pos
+
+
 def main():
     # use PQ to sort integers at random between 1-100
+    import random
+    import string
 
     pq = PriorityQueue()
     for i in range(20):
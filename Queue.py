@@ -1,5 +1,6 @@
 # see https://medium.com/@steveYeah/using-generics-in-python-99010e5056eb
-from typing import Generic, List, TypeVar
+from collections import deque
+from typing import Generic, Iterable, List, Optional, TypeVar
 
 T = TypeVar("T")  # allows variable T to be used to represent a generic type
 
@@ -9,12 +10,13 @@ class EmptyError(Exception):
         self.message = message
 
 class Queue(Generic[T]):
-    ''' class to implement a queue ADT using a Python list '''
+    ''' class to implement a queue ADT using a collections.deque, so that
+        both ends can be pushed and popped in O(1) '''
 
-    __slots__ = ("_data")           # will be a Python list
+    __slots__ = ("_data")           # will be a collections.deque
 
     def __init__(self):
-        self._data: List[T] = []    # typing _data to be a list of type T
+        self._data: deque[T] = deque()  # typing _data to be a deque of type T
 
     def __len__(self) -> int:
         ''' allows the len function to be called using an Arrayqueue object, e.g.,
@@ -34,6 +36,15 @@ class Queue(Generic[T]):
         '''
         self._data.append(item)
 
+    def push_many(self, items: Iterable[T]) -> None:
+        ''' pushes every item of an iterable onto the queue, in order
+        Args:
+            items: an iterable of items of arbitrary type
+        Returns:
+            None
+        '''
+        self._data.extend(items)
+
     def pop(self) -> T:
         ''' removes the topmost element from the queue and returns that element
         Returns:
@@ -43,7 +54,26 @@ class Queue(Generic[T]):
         '''
         if len(self._data) == 0:
             raise EmptyError('Error in Arrayqueue.pop(): queue is empty')
-        return self._data.pop(0)
+        return self._data.popleft()
+
+    def pop_many(self, count: Optional[int] = None) -> List[T]:
+        ''' removes the given number of elements from the front of the queue
+            and returns them in the order they were pushed
+        Args:
+            count: number of elements to remove; all of them if None
+        Returns:
+            a list of the removed items, of arbitrary type
+        Raises:
+            EmptyError exception if the queue holds fewer than count elements
+        '''
+        data = self._data
+        if count is None:
+            items = list(data)
+            data.clear()
+            return items
+        if count > len(data):
+            raise EmptyError('Error in Arrayqueue.pop_many(): queue has too few elements')
+        return [data.popleft() for _ in range(count)]
 
     def top(self) -> T:
         ''' returns the topmost element from the queue without modifying the queue
@@ -0,0 +1,215 @@
+''' asyncio facade over the Maze searches, for calling them from an event loop
+    without blocking it: "await service.solve(spec, algorithm)" runs the
+    search in a bounded worker pool, shares one search between identical
+    concurrent requests, makes callers wait when the pool is full, and stops
+    searches that nobody is waiting for any more '''
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+import asyncio
+import functools
+import threading
+import time
+
+from Maze import CHECK_EVERY, SEARCHES, Maze, MazeSpec, Position, SearchResult
+
+
+class SearchCancelled(Exception):
+    ''' raised inside a search to stop it, once no request is waiting for it
+        or its deadline has passed '''
+
+
+def _solve(spec: MazeSpec, algorithm: str, cancel: Optional[threading.Event], deadline: float) -> SearchResult:
+    ''' builds the maze described by spec and searches it; run in a worker,
+        so a top-level function that worker processes can unpickle
+    Args:
+        cancel:    set to stop the search; None in worker processes, which
+                   only stop at the deadline
+        deadline:  time.monotonic() value after which the search stops
+    Raises:
+        SearchCancelled if the search was stopped, which is looked at before
+        and after building the maze and every CHECK_EVERY expansions of any
+        of the searches
+    '''
+    def stopped() -> bool:
+        return (cancel is not None and cancel.is_set()) or time.monotonic() > deadline
+
+    # building a large maze takes a while too, so look before and after it
+    if stopped():
+        raise SearchCancelled(f"{algorithm} on {spec} stopped before building the maze")
+    maze = Maze(spec.rows, spec.cols, spec.prop_blocked, Position(0, 0), Position(spec.rows - 1, spec.cols - 1),
+                seed = spec.seed)
+    if stopped():
+        raise SearchCancelled(f"{algorithm} on {spec} stopped after building the maze")
+
+    expansions = 0
+
+    def check() -> None:
+        nonlocal expansions
+        expansions += CHECK_EVERY
+        if stopped():
+            raise SearchCancelled(f"{algorithm} on {spec} stopped after {expansions} expansions")
+
+    return maze.search(algorithm, stop = check)
+
+
+class _Job:
+    ''' one search, shared by every request for the same spec and algorithm '''
+
+    __slots__ = ("task", "waiters", "cancel")
+
+    def __init__(self):
+        self.task: Optional[asyncio.Task] = None
+        self.waiters = 0
+        self.cancel = threading.Event()
+
+
+class SolveService:
+    ''' runs searches for an asyncio application in a bounded pool of worker
+        threads or processes; use as "async with SolveService() as service" '''
+
+    def __init__(self, workers: Optional[int] = None, max_pending: int = 64, timeout: float = 30.0,
+                 processes: bool = False, max_cells: int = 4_000_000):
+        '''
+        Args:
+            workers:      size of the worker pool; the executor's default if None
+            max_pending:  most searches handed to the pool at once; further
+                          requests wait for a free place (backpressure)
+            timeout:      default seconds a request may take, waiting included,
+                          and the longest any search may run
+            processes:    use worker processes rather than threads, so that
+                          searches run in parallel; a search in a process is
+                          only stopped by its deadline, not when its
+                          requests give up
+            max_cells:    largest rows * cols a request may ask for
+        '''
+        self._executor: Executor = ProcessPoolExecutor(workers) if processes else ThreadPoolExecutor(workers)
+        self._processes = processes
+        self._slots = asyncio.Semaphore(max_pending)
+        self._timeout = timeout
+        self._max_cells = max_cells
+        self._jobs: Dict[Tuple[MazeSpec, str], _Job] = {}
+
+        # counts of requests, of those that shared a search already under
+        #   way, of those that timed out, and of searches stopped early
+        self.requests = 0
+        self.coalesced = 0
+        self.timeouts = 0
+        self.cancelled = 0
+
+    async def __aenter__(self) -> 'SolveService':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        ''' stops every search still running and shuts the pool down '''
+        for job in self._jobs.values():
+            job.cancel.set()
+        await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(self._executor.shutdown, cancel_futures = True))
+
+    async def solve(self, spec: MazeSpec, algorithm: str = "a_star", timeout: Optional[float] = None) -> SearchResult:
+        ''' searches the maze described by spec without blocking the event
+            loop; a request for a spec and algorithm that is already being
+            searched waits for that search instead of starting another
+        Args:
+            spec:       the maze to search
+            algorithm:  one of the names in SEARCHES
+            timeout:    seconds to wait, the service's timeout if None
+        Returns:
+            the SearchResult
+        Raises:
+            ValueError for an unknown algorithm, a spec with fewer than one
+            row or column, more than max_cells cells or prop_blocked outside
+            [0, 1], or a timeout that is not a number; checked before any
+            search is started
+            asyncio.TimeoutError if the result is not ready in time; the
+            search is stopped once no request is waiting for it
+        '''
+        if algorithm not in SEARCHES:
+            raise ValueError(f"unknown search algorithm '{algorithm}', expected one of {SEARCHES}")
+        if spec.rows < 1 or spec.cols < 1:
+            raise ValueError(f"a maze needs at least one row and column, got {spec.rows}x{spec.cols}")
+        if spec.rows * spec.cols > self._max_cells:
+            raise ValueError(f"{spec.rows}x{spec.cols} maze has more than {self._max_cells} cells")
+        if not 0 <= spec.prop_blocked <= 1:
+            raise ValueError(f"prop_blocked must be between 0 and 1, got {spec.prop_blocked}")
+        timeout = self._timeout if timeout is None else float(timeout)
+        self.requests += 1
+        key = (spec, algorithm)
+        job = self._jobs.get(key)
+        # a search already told to stop cannot be shared, so start another
+        if job is None or job.cancel.is_set():
+            job = self._jobs[key] = _Job()
+            job.task = asyncio.ensure_future(self._run(key, job))
+            job.task.add_done_callback(self._finished)
+        else:
+            self.coalesced += 1
+
+        job.waiters += 1
+        try:
+            # shield the shared search, so that one request giving up does
+            #   not cancel it for the others
+            return await asyncio.wait_for(asyncio.shield(job.task), timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            job.waiters -= 1
+            if job.waiters == 0 and not job.task.done():
+                job.cancel.set()
+
+    async def _run(self, key: Tuple[MazeSpec, str], job: _Job) -> SearchResult:
+        try:
+            async with self._slots:
+                if job.cancel.is_set():
+                    raise SearchCancelled(f"{key[1]} on {key[0]} cancelled before it started")
+                deadline = time.monotonic() + self._timeout
+                cancel = None if self._processes else job.cancel
+                return await asyncio.get_running_loop().run_in_executor(
+                    self._executor, _solve, key[0], key[1], cancel, deadline)
+        finally:
+            if self._jobs.get(key) is job:
+                del self._jobs[key]
+
+    def _finished(self, task: asyncio.Task) -> None:
+        # retrieve the exception of a search nobody waited for, so asyncio
+        #   does not report it as never retrieved
+        if not task.cancelled() and isinstance(task.exception(), SearchCancelled):
+            self.cancelled += 1
+
+
+class LocalClient:
+    ''' in-process client for testing code that uses a SolveService: takes
+        requests as dicts, as a web handler would receive them, and returns
+        dict responses with an HTTP-style status, without any network '''
+
+    def __init__(self, service: SolveService):
+        self._service = service
+
+    async def request(self, body: dict) -> dict:
+        ''' solves one request
+        Args:
+            body: rows, cols, prop_blocked and seed of the maze, and optionally
+                  algorithm and timeout
+        Returns:
+            {"status": 200, "found", "path_length", "count"} on success, or
+            {"status": 400 / 504 / 503 / 500, "error"} for a bad request, a
+            timeout, a search stopped early or any other failure
+        '''
+        try:
+            spec = MazeSpec(int(body["rows"]), int(body["cols"]), float(body["prop_blocked"]), int(body["seed"]))
+            algorithm = body.get("algorithm", "a_star")
+            timeout = body.get("timeout")
+            result = await self._service.solve(spec, algorithm, timeout)
+        except (KeyError, TypeError, ValueError) as error:
+            return {"status": 400, "error": str(error)}
+        except asyncio.TimeoutError:
+            return {"status": 504, "error": "search timed out"}
+        except SearchCancelled as error:
+            return {"status": 503, "error": str(error)}
+        except Exception as error:
+            return {"status": 500, "error": f"{type(error).__name__}: {error}"}
+        return {"status": 200, "found": result.found(), "path_length": len(result.path), "count": result.count}
@@ -0,0 +1,29 @@
+import unittest
+
+from BatchBFS import BatchBFS
+from Maze import Maze, Position
+from test_Maze import seeded_mazes
+
+
+class BatchBFSTest(unittest.TestCase):
+
+    def test_lengths_match_bfs(self):
+        mazes = list(seeded_mazes(count = 60))
+        result = BatchBFS(mazes).solve()
+        for number, maze in enumerate(mazes):
+            bfs = maze.search("bfs")
+            self.assertEqual(result.lengths[number], len(bfs.path))
+            self.assertEqual(result.solvable[number], bfs.found())
+            if bfs.found():
+                self.assertGreaterEqual(result.counts[number], bfs.count)
+            else:
+                self.assertEqual(result.counts[number], bfs.count)
+
+    def test_rejects_mixed_shapes(self):
+        with self.assertRaises(ValueError):
+            BatchBFS([Maze(5, 5, 0.0, Position(0, 0), Position(4, 4)), Maze(5, 6, 0.0, Position(0, 0), Position(4, 5))])
+
+
+
+if __name__ == "__main__":
+    unittest.main()
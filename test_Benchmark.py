@@ -0,0 +1,39 @@
+import argparse
+import contextlib
+import io
+import unittest
+
+from Benchmark import compare, measure, positive_int, solvable_maze, sweep
+from Maze import Maze, Position
+
+
+class BenchmarkTest(unittest.TestCase):
+
+    def test_repeat_must_be_positive(self):
+        self.assertEqual(positive_int("2"), 2)
+        with self.assertRaises(argparse.ArgumentTypeError):
+            positive_int("0")
+        with self.assertRaises(ValueError):
+            measure(Maze(5, 5, 0.0, Position(0, 0), Position(4, 4)), "bfs", 0, False)
+
+    def test_unsolvable_sizes_are_skipped(self):
+        self.assertIsNone(solvable_maze(6, 0.9, 0, tries = 3)[0])
+        errors = io.StringIO()
+        with contextlib.redirect_stderr(errors):
+            records = list(sweep([6, 8], [0.9, 0.1], ["bfs"], 0, 1, False))
+        self.assertIn("skipped 6x6 p=0.9", errors.getvalue())
+        # each solvable maze gives a build_components record and one per solver
+        self.assertEqual([(r["solver"], r["rows"]) for r in records],
+                         [("build_components", 6), ("bfs", 6), ("build_components", 8), ("bfs", 8)])
+        self.assertTrue(all(r["path_length"] for r in records if r["solver"] == "bfs"))
+
+    def test_compare_flags_changed_counts(self):
+        records = list(sweep([8], [0.1], ["bfs", "a_star"], 0, 1, False))
+        self.assertEqual(compare(records, records, 0.25, 0.0), [])
+        changed = [dict(record, count = record["count"] + 1) if record["count"] is not None else record
+                   for record in records]
+        self.assertEqual(len(compare(changed, records, 0.25, 0.0)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
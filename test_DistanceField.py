@@ -0,0 +1,37 @@
+import os
+import tempfile
+import unittest
+
+from DistanceField import DistanceField
+from Maze import Maze, Position
+from test_Maze import seeded_mazes
+
+
+class DistanceFieldTest(unittest.TestCase):
+
+    def test_distances_match_bfs(self):
+        for maze in seeded_mazes(count = 10):
+            field = DistanceField(maze)
+            bfs = maze.search("bfs")
+            self.assertEqual(field.is_reached(), bfs.found())
+            self.assertEqual(field.distance(), len(bfs.path) - 1)
+            if bfs.found():
+                path = field.path_to()
+                self.assertEqual((path[0], path[-1]), (maze._start_index, maze._goal_index))
+                for a, b in zip(path, path[1:]):
+                    self.assertIn(b, maze._neighbor_indices(a))
+
+    def test_loaded_maze_stays_packed(self):
+        maze = Maze(30, 40, 0.25, Position(0, 0), Position(29, 39), seed = 6)
+        with tempfile.TemporaryDirectory() as directory:
+            maze.save(os.path.join(directory, "maze.bin"))
+            loaded = Maze.load(os.path.join(directory, "maze.bin"))
+            with DistanceField(loaded, path = os.path.join(directory, "field.bin")) as field:
+                # the search read the file's blocked bits, not an unpacked grid
+                self.assertIn("_packed", loaded.__dict__)
+                self.assertEqual(field.path_to(), DistanceField(maze).path_to())
+                self.assertEqual(field.count, DistanceField(maze).count)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+from HPAStar import HPAStar
+from Maze import Maze, Position
+from PathValidator import PathValidator
+from test_LPAStar import changes
+
+
+class HPAStarTest(unittest.TestCase):
+
+    def test_plans_match_reachability(self):
+        maze = Maze(40, 40, 0.25, Position(0, 0), Position(39, 39), seed = 5)
+        planner = HPAStar(maze, cluster_size = 8)
+        validator_checks = 0
+        for pos, block in changes(maze, 40, 2):
+            planner.block(pos) if block else planner.unblock(pos)
+            bfs = maze.search("bfs")
+            result = planner.plan()
+            self.assertEqual(result.found(), bfs.found())
+            if bfs.found():
+                check = PathValidator(maze).check(result.path)
+                self.assertTrue(check.contiguous and check.unblocked and check.endpoints)
+                self.assertGreaterEqual(len(result.path), len(bfs.path))
+                validator_checks += 1
+        self.assertGreater(validator_checks, 0)
+        # planning never labels the grid's components
+        self.assertIsNone(maze._components)
+
+    def test_walled_off_goal(self):
+        maze = Maze(16, 16, 0.0, Position(0, 0), Position(15, 15))
+        planner = HPAStar(maze, cluster_size = 4)
+        for col in range(16):
+            planner.block(Position(8, col))
+        result = planner.plan()
+        self.assertFalse(result.found())
+        planner.unblock(Position(8, 5))
+        result = planner.plan()
+        self.assertIn(maze._index(Position(8, 5)), result.path)
+        self.assertTrue(PathValidator(maze).check(result.path).endpoints)
+        self.assertIsNone(maze._components)
+
+
+if __name__ == "__main__":
+    unittest.main()
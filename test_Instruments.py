@@ -0,0 +1,56 @@
+import unittest
+
+from Instruments import Instruments
+from Maze import INSTRUMENTED_SEARCHES, Maze, Position
+from test_Maze import seeded_mazes
+
+
+class InstrumentsTest(unittest.TestCase):
+
+    def test_same_result_as_the_plain_search(self):
+        for maze in seeded_mazes(count = 15):
+            for algorithm in INSTRUMENTED_SEARCHES:
+                with self.subTest(algorithm = algorithm):
+                    plain = maze.search(algorithm)
+                    instrumented = maze.search(algorithm, Instruments())
+                    self.assertEqual(instrumented.path, plain.path)
+                    self.assertEqual(instrumented.count, plain.count)
+                    self.assertEqual(instrumented.visited, plain.visited)
+
+    def test_callbacks_and_counters(self):
+        maze = Maze(12, 12, 0.2, Position(0, 0), Position(11, 11), seed = 4)
+        for algorithm in INSTRUMENTED_SEARCHES:
+            with self.subTest(algorithm = algorithm):
+                events = {"expand": [], "push": [], "pop": [], "goal": []}
+                instruments = Instruments(on_expand = events["expand"].append, on_push = events["push"].append,
+                                          on_pop = events["pop"].append, on_goal = events["goal"].append)
+                result = maze.search(algorithm, instruments)
+                self.assertTrue(result.found())
+                self.assertEqual(events["goal"], [maze._goal_index])
+                self.assertEqual(events["push"][0], maze._start_index)
+                self.assertEqual(len(events["expand"]), instruments.expanded)
+                self.assertEqual(len(events["push"]), instruments.pushed)
+                self.assertEqual(len(events["pop"]), instruments.popped)
+                self.assertLessEqual(instruments.popped, instruments.pushed)
+                self.assertGreaterEqual(instruments.frontier_peak, 1)
+                self.assertEqual(instruments.heuristic_calls > 0, algorithm == "a_star")
+                summary = instruments.summary()
+                self.assertEqual(summary["expanded"], instruments.expanded)
+                self.assertGreater(summary["total_seconds"], 0.0)
+
+    def test_callback_can_abandon_the_search(self):
+        maze = Maze(12, 12, 0.0, Position(0, 0), Position(11, 11))
+
+        def on_expand(index: int) -> None:
+            raise InterruptedError(index)
+
+        with self.assertRaises(InterruptedError):
+            maze.search("bfs", Instruments(on_expand = on_expand))
+
+    def test_other_searches_are_refused(self):
+        with self.assertRaises(ValueError):
+            Maze(5, 5, 0.0, Position(0, 0), Position(4, 4)).search("jps", Instruments())
+
+
+if __name__ == "__main__":
+    unittest.main()
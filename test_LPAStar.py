@@ -0,0 +1,38 @@
+import random
+import unittest
+
+from LPAStar import LPAStar
+from Maze import Maze, Position
+
+
+def changes(maze: Maze, count: int, seed: int):
+    ''' yields (position, block) pairs for random cells other than the start
+        and goal, blocking or unblocking each one '''
+    rng = random.Random(seed)
+    while count > 0:
+        pos = Position(rng.randrange(maze._num_rows), rng.randrange(maze._num_cols))
+        if maze._index(pos) not in (maze._start_index, maze._goal_index):
+            count -= 1
+            yield pos, rng.random() < 0.6
+
+
+class LPAStarTest(unittest.TestCase):
+
+    def test_repairs_match_bfs(self):
+        maze = Maze(20, 20, 0.2, Position(0, 0), Position(19, 19), seed = 3)
+        planner = LPAStar(maze)
+        self.assertEqual(len(planner.plan().path), len(maze.search("bfs").path))
+        for pos, block in changes(maze, 60, 1):
+            planner.block(pos) if block else planner.unblock(pos)
+            self.assertEqual(len(planner.plan().path), len(maze.search("bfs").path))
+
+    def test_repair_expands_less_than_the_first_plan(self):
+        maze = Maze(40, 40, 0.1, Position(0, 0), Position(39, 39), seed = 2)
+        planner = LPAStar(maze)
+        first = planner.plan().count
+        planner.block(Position(39, 20))
+        self.assertLess(planner.plan().count, first)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,364 @@
+import contextlib
+import io
+import os
+import re
+import tempfile
+import unittest
+
+from Maze import (BLOCKED, EMPTY, MAZE_HEADER, MAZE_MAGIC, MAZE_VERSION, SEARCHES, Contents, Maze, MazeSpec, Position,
+                  random_contents, run_experiments)
+
+
+def seeded_mazes(rows: int = 15, cols: int = 20, count: int = 40, **kwargs):
+    ''' yields count mazes over a range of densities, from fixed seeds, with
+        the start and goal in opposite corners '''
+    for seed in range(count):
+        yield Maze(rows, cols, (0.0, 0.1, 0.2, 0.3, 0.4)[seed % 5], Position(0, 0), Position(rows - 1, cols - 1),
+                   seed = seed, **kwargs)
+
+
+class SearchTest(unittest.TestCase):
+
+    def assertPath(self, maze: Maze, path) -> None:
+        ''' checks that path runs from start to goal over open neighbours '''
+        self.assertEqual(path[0], maze._start_index)
+        self.assertEqual(path[-1], maze._goal_index)
+        for a, b in zip(path, path[1:]):
+            self.assertIn(b, maze._neighbor_indices(a))
+            self.assertNotEqual(maze._contents[b], BLOCKED)
+
+    def test_searches_match_bfs(self):
+        solvable = 0
+        for maze in seeded_mazes():
+            bfs = maze.search("bfs")
+            solvable += bfs.found()
+            for algorithm in SEARCHES:
+                with self.subTest(algorithm = algorithm, maze = maze._contents.hex()):
+                    result = maze.search(algorithm)
+                    self.assertEqual(result.found(), bfs.found())
+                    if not result.found():
+                        continue
+                    self.assertPath(maze, result.path)
+                    if algorithm == "dfs":
+                        self.assertGreaterEqual(len(result.path), len(bfs.path))
+                    elif algorithm == "weighted_a_star":
+                        self.assertLessEqual(len(result.path) - 1, 2.0 * (len(bfs.path) - 1))
+                    else:
+                        self.assertEqual(len(result.path), len(bfs.path))
+        # the seeds must give both kinds of maze
+        self.assertTrue(0 < solvable < 40)
+
+    def test_wrapper_methods(self):
+        maze = next(seeded_mazes())
+        node, count = maze.a_star()
+        self.assertEqual(maze.path_length(node), len(maze.search("a_star").path))
+        self.assertEqual(count, maze.search("a_star").count)
+
+    def test_searches_leave_the_maze_unchanged(self):
+        maze = next(seeded_mazes())
+        before = bytes(maze._contents)
+        for algorithm in SEARCHES:
+            result = maze.search(algorithm)
+            self.assertEqual(bytes(maze._contents), before)
+            # the visited mask has one byte per cell and marks the start
+            self.assertEqual(len(result.visited), len(before))
+            self.assertEqual(result.visited[maze._start_index], 1)
+
+    def test_unknown_algorithm(self):
+        with self.assertRaises(ValueError):
+            Maze(5, 5, 0.0, Position(0, 0), Position(4, 4)).search("nope")
+
+
+class FileFormatTest(unittest.TestCase):
+
+    def test_save_and_load(self):
+        maze = Maze(13, 17, 0.3, Position(1, 2), Position(11, 15), seed = 4,
+                    costs = [1 + i % 3 for i in range(13 * 17)], connectivity = 8)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "maze.bin")
+            maze.save(path)
+            loaded = Maze.load(path)
+            self.assertEqual(loaded._contents, maze._contents)
+            self.assertEqual(loaded._costs, maze._costs)
+            self.assertEqual(loaded._connectivity, 8)
+            self.assertEqual(loaded.search("dijkstra").path, maze.search("dijkstra").path)
+
+    def test_load_rejects_other_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "other.bin")
+            with open(path, "wb") as file:
+                file.write(b"not a maze file at all, just some bytes")
+            with self.assertRaises(ValueError):
+                Maze.load(path)
+
+    def test_load_rejects_bad_headers(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bad.bin")
+            for rows, cols, start, goal in ((4, 4, (0, 0), (9, 9)), (4, 4, (0, 4), (3, 3)), (0, 5, (0, 0), (0, 0)),
+                                            (5, 0, (0, 0), (0, 0))):
+                with self.subTest(rows = rows, cols = cols, start = start, goal = goal):
+                    with open(path, "wb") as file:
+                        file.write(MAZE_HEADER.pack(MAZE_MAGIC, MAZE_VERSION, 0, 0, rows, cols, *start, *goal))
+                        file.write(bytes((rows * cols + 7) // 8))
+                    with self.assertRaises(ValueError):
+                        Maze.load(path)
+
+
+class JumpTest(unittest.TestCase):
+
+    def scan(self, maze: Maze, index: int, step: int) -> int:
+        ''' the horizontal move of jump point search, one cell at a time '''
+        contents, cols = maze._contents, maze._num_cols
+        row_start = index - index % cols
+        while True:
+            index += step
+            if not row_start <= index < row_start + cols or contents[index] == BLOCKED:
+                return -1
+            if index == maze._goal_index:
+                return index
+            for side in (-cols, cols):
+                if 0 <= index + side < len(contents) and contents[index + side] != BLOCKED \
+                        and contents[index + side - step] == BLOCKED:
+                    return index
+
+    def test_horizontal_moves_match_a_scan(self):
+        for maze in seeded_mazes(rows = 7, cols = 9, count = 20):
+            stops = (re.compile(b"[^\x00]").search,) + maze._jump_stops()
+            for index in range(len(maze._contents)):
+                if maze._contents[index] != BLOCKED:
+                    for step in (1, -1):
+                        self.assertEqual(maze._jump_horizontal(index, step, stops), self.scan(maze, index, step))
+
+
+class CostTest(unittest.TestCase):
+
+    def test_dijkstra_is_cheapest(self):
+        for number, maze in enumerate(seeded_mazes(count = 20)):
+            costs = [1 + (i * 7 + number) % 5 for i in range(len(maze._contents))]
+            maze.set_costs(costs)
+            dijkstra = maze.search("dijkstra")
+            if not dijkstra.found():
+                continue
+            best = maze.path_cost(dijkstra.path)
+            for epsilon in (1.0, 1.5, 3.0):
+                weighted = maze.search("weighted_a_star", epsilon = epsilon)
+                self.assertAlmostEqual(min(best, maze.path_cost(weighted.path)), best, places = 4)
+                self.assertLessEqual(maze.path_cost(weighted.path), epsilon * best + 1e-6)
+
+    def test_node_costs_follow_what_each_search_minimises(self):
+        maze = Maze(10, 10, 0.1, Position(0, 0), Position(9, 9), seed = 2,
+                    costs = [1 + i % 4 for i in range(100)])
+        node, _ = maze.a_star()
+        # a_star counts steps, so its goal Node is the path length away
+        self.assertEqual(node.cost, maze.path_length(node) - 1)
+        node, _ = maze.dijkstra()
+        self.assertAlmostEqual(node.cost, maze.path_cost(maze.search("dijkstra").path), places = 4)
+
+
+class DiagonalTest(unittest.TestCase):
+
+    def test_diagonal_searches_agree(self):
+        for corner_cutting in (False, True):
+            for maze in seeded_mazes(count = 20, connectivity = 8, corner_cutting = corner_cutting):
+                dijkstra = maze.search("dijkstra")
+                for algorithm in ("bfs", "dfs", "a_star"):
+                    self.assertEqual(maze.search(algorithm).found(), dijkstra.found())
+                if dijkstra.found():
+                    self.assertAlmostEqual(maze.path_cost(maze.search("a_star").path), maze.path_cost(dijkstra.path))
+
+    def test_diagonal_rejects_other_searches(self):
+        maze = Maze(5, 5, 0.0, Position(0, 0), Position(4, 4), connectivity = 8)
+        with self.assertRaises(ValueError):
+            maze.search("jps")
+
+
+class ComponentTest(unittest.TestCase):
+
+    def test_is_reachable_follows_changes(self):
+        maze = Maze(5, 5, 0.0, Position(0, 0), Position(4, 4))
+        self.assertTrue(maze.is_reachable(Position(0, 0), Position(4, 4)))
+        for col in range(5):
+            maze.set_contents(Position(2, col), Contents.BLOCKED)
+        self.assertFalse(maze.is_reachable(Position(0, 0), Position(4, 4)))
+        self.assertFalse(maze.search("bfs").found())
+        maze.set_contents(Position(2, 3), Contents.EMPTY)
+        self.assertTrue(maze.is_reachable(Position(0, 0), Position(4, 4)))
+        self.assertTrue(maze.search("bfs").found())
+
+    def test_search_uses_only_built_labels(self):
+        maze = Maze(5, 5, 0.0, Position(0, 0), Position(4, 4))
+        for col in range(5):
+            maze.set_contents(Position(2, col), Contents.BLOCKED)
+        result = maze.search("bfs")
+        self.assertIsNone(maze._components)
+        self.assertFalse(result.found())
+        self.assertEqual(result.count, 9)
+        maze.build_components()
+        self.assertEqual(maze.search("bfs").count, 0)
+
+
+class QueryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.maze = Maze(20, 20, 0.2, Position(0, 0), Position(19, 19), seed = 1)
+        self.cells = [Position(0, 0), Position(19, 19), Position(0, 19), Position(19, 0)]
+        self.cells = [pos for pos in self.cells if self.maze._contents[self.maze._index(pos)] != BLOCKED]
+
+    def test_lru_eviction(self):
+        maze = self.maze
+        maze.set_query_cache_size(2)
+        a, b, c = self.cells[:3]
+        first = maze.shortest_path(a, b)
+        maze.shortest_path(a, c)
+        # using a to b again makes a to c the least recently used
+        self.assertIs(maze.shortest_path(a, b).path, first.path)
+        maze.shortest_path(b, c)
+        self.assertEqual(list(maze._query_cache), [(maze._index(a), maze._index(b)), (maze._index(b), maze._index(c))])
+        maze.set_query_cache_size(1)
+        self.assertEqual(list(maze._query_cache), [(maze._index(b), maze._index(c))])
+        maze.set_query_cache_size(0)
+        maze.shortest_path(a, b)
+        self.assertEqual(len(maze._query_cache), 0)
+
+    def test_reverse_query_reuses_the_path(self):
+        maze = self.maze
+        a, b = self.cells[:2]
+        forward = maze.shortest_path(a, b)
+        backward = maze.shortest_path(b, a)
+        self.assertEqual(list(backward.path), list(reversed(forward.path)))
+        self.assertEqual(backward.count, forward.count)
+        self.assertEqual(len(maze._query_cache), 1)
+
+    def test_landmarks_keep_paths_shortest(self):
+        maze = self.maze
+        plain = {(a, b): maze.shortest_path(a, b) for a in self.cells for b in self.cells}
+        maze.build_landmarks(4)
+        self.assertEqual(len(maze._landmarks), 4)
+        self.assertEqual(len(maze._query_cache), 0)
+        for (a, b), result in plain.items():
+            with_landmarks = maze.shortest_path(a, b)
+            self.assertEqual(len(with_landmarks.path), len(result.path))
+            self.assertLessEqual(with_landmarks.count, result.count)
+
+    def test_cell_changes_drop_cache_and_landmarks(self):
+        maze = self.maze
+        maze.build_landmarks(2)
+        a, b = self.cells[:2]
+        path = maze.shortest_path(a, b).path
+        self.assertTrue(len(path) > 2)
+        blocked = maze._cell(path[len(path) // 2]).get_position()
+        maze.set_contents(blocked, Contents.BLOCKED)
+        self.assertEqual(len(maze._query_cache), 0)
+        self.assertEqual(maze._landmarks, [])
+        result = maze.shortest_path(a, b)
+        self.assertNotIn(maze._index(blocked), result.path)
+        self.assertEqual(len(result.path), len(maze.search("bfs").path))
+
+
+class RandomContentsTest(unittest.TestCase):
+
+    def test_exact_blocked_count(self):
+        for rows, cols in ((1, 2), (3, 7), (40, 25)):
+            size = rows * cols
+            for prop_blocked in (0.0, 0.01, 0.3, 0.5, 0.97, 1.0):
+                for seed in range(5):
+                    with self.subTest(rows = rows, cols = cols, prop_blocked = prop_blocked, seed = seed):
+                        start, goal = seed % size, size - 1 - seed % size
+                        if start == goal:
+                            continue
+                        contents = random_contents(rows, cols, prop_blocked, start, goal, seed)
+                        self.assertEqual(len(contents), size)
+                        self.assertEqual(contents.count(BLOCKED), round((size - 2) * prop_blocked))
+                        self.assertEqual(contents.count(BLOCKED) + contents.count(EMPTY), size)
+                        self.assertEqual((contents[start], contents[goal]), (EMPTY, EMPTY))
+
+    def test_same_seed_same_maze(self):
+        first = Maze(30, 30, 0.3, Position(0, 0), Position(29, 29), seed = 11)
+        again = Maze(30, 30, 0.3, Position(0, 0), Position(29, 29), seed = 11)
+        other = Maze(30, 30, 0.3, Position(0, 0), Position(29, 29), seed = 12)
+        self.assertEqual(first._contents, again._contents)
+        self.assertNotEqual(first._contents, other._contents)
+        self.assertEqual(random_contents(30, 30, 0.3, 0, 899, 11), random_contents(30, 30, 0.3, 0, 899, 11))
+
+
+class MultiSearchTest(unittest.TestCase):
+
+    def test_multi_search(self):
+        for maze in seeded_mazes(count = 10):
+            goals = [Position(maze._num_rows - 1, 0), Position(0, maze._num_cols - 1), maze._goal.get_position()]
+            for algorithm in ("bfs", "a_star"):
+                result, goal = maze.multi_search([Position(0, 0)], goals, algorithm)
+                distances = maze._bfs_distances(maze._start_index)
+                reachable = [distances[maze._index(pos)] + 1 for pos in goals if distances[maze._index(pos)] >= 0]
+                if not reachable:
+                    self.assertIsNone(goal)
+                else:
+                    self.assertEqual(len(result.path), min(reachable))
+                    self.assertIn(goal, goals)
+
+    def test_source_on_a_goal(self):
+        maze = Maze(6, 6, 0.0, Position(0, 0), Position(5, 5))
+        for algorithm in ("bfs", "a_star"):
+            result, goal = maze.multi_search([Position(3, 3), Position(0, 0)], [Position(0, 0)], algorithm)
+            self.assertEqual((list(result.path), goal), ([0], Position(0, 0)))
+
+
+class ExperimentTest(unittest.TestCase):
+
+    def test_workers_give_the_same_results(self):
+        specs = [MazeSpec(12, 15, (0.1, 0.3, 0.45)[seed % 3], seed) for seed in range(30)]
+        alone = dict(run_experiments(specs, workers = 1))
+        pooled = dict(run_experiments(specs, workers = 2, chunksize = 4))
+        self.assertEqual(pooled, alone)
+        self.assertEqual(set(alone), set(specs))
+        # the seeds must give both solvable and unsolvable mazes
+        self.assertIn("This maze is not solvable", alone.values())
+        self.assertTrue(any(isinstance(result, list) for result in alone.values()))
+
+
+class RenderTest(unittest.TestCase):
+
+    def test_path_overlay_leaves_maze_unchanged(self):
+        maze = Maze(4, 4, 0.0, Position(0, 0), Position(3, 3))
+        before = maze.render()
+        drawn = maze.render(maze.search("bfs").path)
+        self.assertEqual(maze.render(), before)
+        self.assertEqual(drawn.count(Contents.PATH.value), 5)
+        self.assertEqual(len(drawn.splitlines()), 4)
+
+    def test_viewport(self):
+        maze = Maze(10, 12, 0.0, Position(0, 0), Position(9, 11))
+        path = [maze._index(Position(4, 5)), maze._index(Position(5, 5)), maze._index(Position(5, 6))]
+        self.assertEqual(maze.viewport(path, 1), (Position(3, 4), Position(6, 7)))
+        # the box is clipped to the maze
+        self.assertEqual(maze.viewport(path, 6), (Position(0, 0), Position(9, 11)))
+        self.assertEqual(maze.viewport([], 1), (Position(0, 0), Position(9, 11)))
+        drawn = maze.render(path, maze.viewport(path, 1)).splitlines()
+        self.assertEqual(len(drawn), 4)
+        self.assertEqual(drawn, ["|" + line[1 + 3 * 4:1 + 3 * 8] for line in maze.render(path).splitlines()[3:7]])
+
+    def test_write_matches_render(self):
+        maze = next(seeded_mazes())
+        path = maze.search("bfs").path
+        viewport = maze.viewport(path, 2)
+        out = io.StringIO()
+        maze.write(out, path, viewport)
+        self.assertEqual(out.getvalue(), maze.render(path, viewport) + "\n")
+
+    def test_show_path(self):
+        maze = Maze(12, 12, 0.0, Position(0, 0), Position(3, 3))
+        result = maze.search("bfs")
+        node, _ = maze.bfs()
+        shown = []
+        for found in (result, node):
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                maze.show_path(found, margin = 1)
+            shown.append(out.getvalue())
+        self.assertEqual(shown[0], shown[1])
+        self.assertEqual(shown[0], maze.render(result.path, maze.viewport(result.path, 1)) + "\n")
+        self.assertEqual(len(shown[0].splitlines()), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import math
+import unittest
+
+from Maze import Maze, Position
+from PathValidator import PathValidator
+from test_Maze import seeded_mazes
+
+
+class PathValidatorTest(unittest.TestCase):
+
+    def test_search_paths_pass(self):
+        for maze in seeded_mazes(count = 20):
+            validator = PathValidator(maze)
+            for algorithm in ("bfs", "a_star", "jps", "bidirectional_bfs"):
+                self.assertTrue(validator.check(maze.search(algorithm).path).ok())
+
+    def test_cheapest_paths_pass(self):
+        for maze in seeded_mazes(count = 20, connectivity = 8):
+            validator = PathValidator(maze)
+            for algorithm in ("a_star", "dijkstra"):
+                self.assertTrue(validator.check(maze.search(algorithm).path).ok())
+        fewer_steps = 0
+        for number, maze in enumerate(seeded_mazes(count = 20)):
+            maze.set_costs([1 + (i * 7 + number) % 5 for i in range(len(maze._contents))])
+            validator = PathValidator(maze)
+            cheapest = maze.search("dijkstra").path
+            self.assertTrue(validator.check(cheapest).ok())
+            bfs = maze.search("bfs").path
+            if bfs:
+                cheap = math.isclose(maze.path_cost(bfs), maze.path_cost(cheapest))
+                self.assertEqual(validator.check(bfs).shortest, cheap)
+                fewer_steps += not cheap
+        # the costs make the fewest steps dearer than the cheapest path somewhere
+        self.assertGreater(fewer_steps, 0)
+
+    def test_broken_paths_fail(self):
+        maze = Maze(5, 5, 0.0, Position(0, 0), Position(4, 4))
+        validator = PathValidator(maze)
+        path = maze.search("bfs").path
+        self.assertFalse(validator.check(path[:-1]).endpoints)
+        self.assertFalse(validator.check(path[:2] + path[3:]).contiguous)
+        # stepping east off the end of a row wraps to the next row
+        self.assertFalse(validator.check([0, 1, 2, 3, 4, 5, 10, 15, 20, 21, 22, 23, 24]).contiguous)
+        self.assertFalse(validator.check(list(path[:1]) + [1, 2, 1] + list(path[2:])).shortest)
+        # a path of the right length that jumps between cells is not shortest
+        jumping = validator.check([0, 1, 2, 3, 4, 9, 14, 18, 24])
+        self.assertFalse(jumping.contiguous)
+        self.assertFalse(jumping.shortest)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import random
+import unittest
+
+from PriorityQueue import IndexedPriorityQueue, PriorityQueue
+
+
+class IndexedPriorityQueueTest(unittest.TestCase):
+
+    def assertHeap(self, queue: IndexedPriorityQueue) -> None:
+        ''' checks the heap order and that _positions and _handles agree '''
+        container, handles, positions = queue._container, queue._handles, queue._positions
+        self.assertEqual(len(container), len(handles))
+        self.assertEqual(len(positions), len(handles))
+        for pos in range(1, len(container)):
+            self.assertFalse(container[pos] < container[(pos - 1) >> 1], f"heap order broken at {pos}")
+        for pos, handle in enumerate(handles):
+            self.assertEqual(positions[handle], pos)
+
+    def test_remove_min_sorts(self):
+        rng = random.Random(1)
+        keys = [rng.random() for _ in range(200)]
+        queue = IndexedPriorityQueue()
+        for handle, key in enumerate(keys):
+            queue.insert(key, handle, handle)
+        self.assertHeap(queue)
+        popped = [queue.remove_min()._key for _ in range(len(keys))]
+        self.assertEqual(popped, sorted(keys))
+        self.assertTrue(queue.is_empty())
+
+    def test_insert_twice_raises(self):
+        queue = IndexedPriorityQueue()
+        queue.insert(1, "a", 7)
+        with self.assertRaises(KeyError):
+            queue.insert(2, "b", 7)
+
+    def test_decrease_key(self):
+        queue = IndexedPriorityQueue()
+        for handle in range(10):
+            queue.insert(10 + handle, handle, handle)
+        queue.decrease_key(9, 0, "nine")
+        self.assertHeap(queue)
+        self.assertEqual(queue.min()._value, "nine")
+        with self.assertRaises(ValueError):
+            queue.decrease_key(3, 50)
+
+    def test_contains_and_remove(self):
+        queue = IndexedPriorityQueue()
+        for handle in range(10):
+            queue.insert(handle, handle, handle)
+        self.assertIn(4, queue)
+        self.assertTrue(queue.contains(4))
+        self.assertEqual(queue.remove(4)._value, 4)
+        self.assertNotIn(4, queue)
+        self.assertHeap(queue)
+        self.assertEqual([queue.remove_min()._value for _ in range(len(queue))], [0, 1, 2, 3, 5, 6, 7, 8, 9])
+
+    def test_update_or_insert(self):
+        queue = IndexedPriorityQueue()
+        self.assertTrue(queue.update_or_insert(1, 5, "a"))
+        self.assertTrue(queue.update_or_insert(2, 3, "b"))
+        self.assertFalse(queue.update_or_insert(1, 1, "c"))
+        self.assertEqual(len(queue), 2)
+        self.assertEqual(queue.min()._value, "c")
+        # a larger key moves the entry down again
+        self.assertFalse(queue.update_or_insert(1, 9, "d"))
+        self.assertHeap(queue)
+        self.assertEqual([queue.remove_min()._value for _ in range(2)], ["b", "d"])
+
+    def test_random_operations_keep_invariants(self):
+        rng = random.Random(2)
+        queue = IndexedPriorityQueue()
+        keys = {}
+        for _ in range(3000):
+            op = rng.random()
+            handle = rng.randrange(100)
+            if op < 0.5:
+                keys[handle] = (rng.randrange(50), rng.randrange(50))
+                queue.update_or_insert(handle, keys[handle], handle)
+            elif op < 0.7 and handle in keys:
+                keys[handle] = min(keys[handle], (rng.randrange(50), 0))
+                queue.decrease_key(handle, keys[handle])
+            elif op < 0.85 and handle in keys:
+                self.assertEqual(queue.remove(handle)._key, keys.pop(handle))
+            elif keys:
+                entry = queue.remove_min()
+                self.assertEqual(entry._key, min(keys.values()))
+                self.assertEqual(keys.pop(entry._value), entry._key)
+            self.assertHeap(queue)
+            self.assertEqual(len(queue), len(keys))
+
+    def test_tuple_keys_break_ties_on_second_item(self):
+        queue = IndexedPriorityQueue()
+        queue.insert((5, 3), "far", 0)
+        queue.insert((5, 1), "near", 1)
+        self.assertEqual(queue.remove_min()._value, "near")
+
+
+class PriorityQueueTest(unittest.TestCase):
+
+    def test_remove_min_sorts(self):
+        queue = PriorityQueue()
+        for key in (5, 3, 8, 1):
+            queue.insert(key, str(key))
+        self.assertEqual(queue.min()._key, 1)
+        self.assertEqual([queue.remove_min()._key for _ in range(4)], [1, 3, 5, 8])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+from Queue import EmptyError, Queue
+
+
+class QueueTest(unittest.TestCase):
+
+    def test_first_in_first_out(self):
+        queue = Queue()
+        for item in range(5):
+            queue.push(item)
+        self.assertEqual(len(queue), 5)
+        self.assertEqual([queue.pop() for _ in range(5)], [0, 1, 2, 3, 4])
+        self.assertTrue(queue.is_empty())
+        with self.assertRaises(EmptyError):
+            queue.pop()
+
+    def test_push_many_and_pop_many(self):
+        queue = Queue()
+        queue.push_many(range(3))
+        queue.push(3)
+        queue.push_many(iter([4, 5]))
+        self.assertEqual(queue.pop_many(2), [0, 1])
+        self.assertEqual(queue.pop(), 2)
+        self.assertEqual(queue.pop_many(), [3, 4, 5])
+        self.assertTrue(queue.is_empty())
+        self.assertEqual(queue.pop_many(), [])
+        self.assertEqual(queue.pop_many(0), [])
+
+    def test_pop_many_too_many_raises(self):
+        queue = Queue()
+        queue.push_many("ab")
+        with self.assertRaises(EmptyError):
+            queue.pop_many(3)
+        # nothing was removed by the failed call
+        self.assertEqual(queue.pop_many(2), ["a", "b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
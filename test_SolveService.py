@@ -0,0 +1,106 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest import mock
+
+import SolveService as solve_service
+from Maze import MazeSpec
+from SolveService import LocalClient, SearchCancelled, SolveService, _solve
+
+
+class SolveServiceTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_identical_requests_share_one_search(self):
+        body = {"rows": 60, "cols": 60, "prop_blocked": 0.2, "seed": 3, "algorithm": "bfs"}
+        with mock.patch.object(solve_service, "_solve", wraps = _solve) as solve:
+            async with SolveService(workers = 2) as service:
+                client = LocalClient(service)
+                responses = await asyncio.gather(*(client.request(body) for _ in range(8)))
+        self.assertEqual(solve.call_count, 1)
+        self.assertEqual(service.requests, 8)
+        self.assertEqual(service.coalesced, 7)
+        self.assertEqual(responses, [responses[0]] * 8)
+        self.assertEqual(responses[0]["status"], 200)
+
+    async def test_timeout_stops_the_search(self):
+        stopped = []
+
+        def solve(*args):
+            try:
+                return _solve(*args)
+            except SearchCancelled as error:
+                stopped.append(str(error))
+                raise
+
+        # an open 1000x1000 maze builds in about 10 ms, but bfs takes most of
+        #   a second, so the search is stopped through its stop callable
+        body = {"rows": 1000, "cols": 1000, "prop_blocked": 0.0, "seed": 0, "algorithm": "bfs", "timeout": 0.1}
+        with mock.patch.object(solve_service, "_solve", solve):
+            async with SolveService(workers = 1) as service:
+                response = await LocalClient(service).request(body)
+                for _ in range(100):
+                    if service.cancelled:
+                        break
+                    await asyncio.sleep(0.02)
+                self.assertEqual(response["status"], 504)
+                self.assertEqual(service.timeouts, 1)
+                self.assertEqual(service.cancelled, 1)
+                self.assertEqual(service._jobs, {})
+        self.assertEqual(len(stopped), 1)
+        self.assertIn("expansions", stopped[0])
+
+    async def test_max_pending_limits_searches_in_the_pool(self):
+        lock = threading.Lock()
+        running = peak = 0
+
+        def solve(*args):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            try:
+                time.sleep(0.02)
+                return _solve(*args)
+            finally:
+                with lock:
+                    running -= 1
+
+        with mock.patch.object(solve_service, "_solve", solve):
+            async with SolveService(workers = 4, max_pending = 2) as service:
+                client = LocalClient(service)
+                responses = await asyncio.gather(*(
+                    client.request({"rows": 20, "cols": 20, "prop_blocked": 0.2, "seed": seed}) for seed in range(8)))
+        self.assertEqual([response["status"] for response in responses], [200] * 8)
+        self.assertEqual(peak, 2)
+
+    async def test_bad_requests_start_no_search(self):
+        good = {"rows": 10, "cols": 10, "prop_blocked": 0.2, "seed": 0}
+        bad = [{"rows": 0}, {"cols": 0}, {"rows": -3}, {"prop_blocked": 2.0}, {"prop_blocked": -0.1},
+               {"rows": 3000, "cols": 3000}, {"timeout": "abc"}, {"timeout": [1]}, {"algorithm": "dfs2"},
+               {"seed": "x"}]
+        with mock.patch.object(solve_service, "_solve", wraps = _solve) as solve:
+            async with SolveService(max_cells = 1_000_000) as service:
+                client = LocalClient(service)
+                for change in bad:
+                    with self.subTest(change = change):
+                        response = await client.request({**good, **change})
+                        self.assertEqual(response["status"], 400)
+                        self.assertEqual(service._jobs, {})
+                missing = dict(good)
+                del missing["seed"]
+                self.assertEqual((await client.request(missing))["status"], 400)
+                with self.assertRaises(ValueError):
+                    await service.solve(MazeSpec(0, 5, 0.0, 0))
+        self.assertEqual(service.requests, 0)
+        solve.assert_not_called()
+
+    async def test_unexpected_error_is_a_500(self):
+        with mock.patch.object(solve_service, "_solve", side_effect = MemoryError("too big")):
+            async with SolveService(workers = 1) as service:
+                response = await LocalClient(service).request({"rows": 5, "cols": 5, "prop_blocked": 0.0, "seed": 0})
+        self.assertEqual(response, {"status": 500, "error": "MemoryError: too big"})
+
+
+if __name__ == "__main__":
+    unittest.main()